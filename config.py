@@ -172,6 +172,27 @@ MAX_JOBS_TO_PROCESS_PER_RUN = int(get_config('application.max_jobs_per_run', 'MA
 APPLICATION_DELAY_MIN = int(get_config('application.delay.min', 'APPLICATION_DELAY_MIN', 0))
 APPLICATION_DELAY_MAX = int(get_config('application.delay.max', 'APPLICATION_DELAY_MAX', 0))
 
+# Retries for transient LLM errors in the browser-use agent (timeouts, rate limits, 5xx, dropped connections)
+# Backoff is exponential (1s, 2s, 4s, ... capped at 60s) with random jitter so parallel workers don't retry in lockstep
+LLM_MAX_RETRIES = int(get_config('application.llm_max_retries', 'LLM_MAX_RETRIES', 5))
+LLM_RETRY_JITTER_ENABLED = str(get_config('application.llm_retry_jitter', 'LLM_RETRY_JITTER_ENABLED', 'true')).lower() in ('1', 'true', 'yes')
+
+# Browser-use applications run concurrently by BrowserUseFiller.apply_batch (1 = one at a time)
+# Raising this overlaps LLM latency across jobs; each extra slot gets its own browser profile directory
+MAX_CONCURRENT_APPLICATIONS = int(get_config('application.max_concurrent', 'MAX_CONCURRENT_APPLICATIONS', 1))
+
+# Browser-use agent limits per application: step ceiling and wall-clock timeout (seconds)
+# Once an ATS has enough successful runs, max steps adapts down to ~1.3x its p95 step count
+AGENT_MAX_STEPS = int(get_config('application.agent_max_steps', 'AGENT_MAX_STEPS', 50))
+AGENT_WALL_TIMEOUT_S = int(get_config('application.agent_timeout_seconds', 'AGENT_WALL_TIMEOUT_S', 240))
+
+# Route BrowserUseFiller.apply() through a long-lived worker pool (BROWSER_POOL_SIZE workers on one event loop)
+USE_BROWSER_POOL = str(get_config('application.use_browser_pool', 'USE_BROWSER_POOL', 'false')).lower() in ('1', 'true', 'yes')
+BROWSER_POOL_SIZE = int(get_config('application.browser_pool_size', 'BROWSER_POOL_SIZE', 1))
+
+# HTTP connections kept open from the Selenium client to chromedriver (urllib3 pool maxsize)
+WEBDRIVER_POOL_MAXSIZE = int(get_config('application.webdriver_pool_maxsize', 'WEBDRIVER_POOL_MAXSIZE', 20))
+
 # --- Job Status Constants (CLEANED - No Duplicates) ---
 # New/Processing States
 JOB_STATUS_NEW = "new"
@@ -106,6 +106,8 @@ def store_job_data(job_data):
     if not primary_id: logger.warning(f"DB: Could not normalize source_url '{source_url}'. Skipping."); return None
     doc_to_store = job_data.copy(); now = datetime.datetime.now(datetime.timezone.utc)
     doc_to_store['primary_identifier'] = primary_id; doc_to_store['last_updated'] = now
+    # Short excerpt stored once so prompt builders don't copy the full description per application
+    if isinstance(doc_to_store.get('description'), str): doc_to_store['job_description_excerpt'] = doc_to_store['description'][:500]
     if not doc_to_store.get('job_title') or not doc_to_store.get('company_name'): logger.warning(f"DB: Skipping '{primary_id}', missing title/company."); return None
     update_op = {'$set': doc_to_store, '$addToSet': {'sources_list': doc_to_store.get('source_platform')},
                  '$setOnInsert': {'date_scraped': now, 'status': config.JOB_STATUS_NEW, 'status_reason': "Newly scraped",
@@ -4,8 +4,15 @@ import logging
 import time
 import json
 import sys
+import queue
+import hashlib
+import sqlite3
+import atexit
+import threading
+from html import escape as html_escape
 from pathlib import Path
 from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from abc import ABC, abstractmethod
 from typing import Dict, List, Optional, Tuple, Union, Any
 from selenium.webdriver.remote.webdriver import WebDriver
@@ -21,19 +28,344 @@ from selenium.webdriver.common.by import By
 from selenium.webdriver.common.keys import Keys
 from selenium.webdriver.support.select import Select
 
-# Added import for datetime
-from datetime import datetime # timezone can be used for Python 3.11+ for explicit UTC
+from datetime import datetime, timezone
 
 try:
     import config
-    from ..intelligence.llm_clients import get_llm_client
+    from ..intelligence.llm_clients import get_llm_client, get_json_llm_client
 except ImportError:
     sys.path.append(str(Path(__file__).resolve().parent.parent.parent))
     import config
-    from job_automator.intelligence.llm_clients import get_llm_client
+    from job_automator.intelligence.llm_clients import get_llm_client, get_json_llm_client
 
-# Path for the locator storage JSON file, relative to base_filler.py
-LOCATOR_STORAGE_FILE_PATH = Path(__file__).parent / "ai_identified_locators.json"
+# orjson is an optional speedup for the large profile/job dicts and AI responses;
+# fall back to the stdlib json module when it is not installed.
+try:
+    import orjson
+    def _dumps(obj: Any) -> str:
+        return orjson.dumps(obj).decode()
+    _loads = orjson.loads
+except ImportError:
+    orjson = None
+    def _dumps(obj: Any) -> str:
+        # Compact separators to match orjson's output and keep prompts small.
+        return json.dumps(obj, separators=(',', ':'))
+    _loads = json.loads
+
+# lxml is optional: with it, large HTML is chunked along element boundaries (see _split_html_chunks)
+try:
+    import lxml.html as lxml_html
+except ImportError:
+    lxml_html = None
+
+
+def _slice_chunks(text: str, max_chunk_size: int) -> List[str]:
+    return [text[i:i + max_chunk_size] for i in range(0, len(text), max_chunk_size)]
+
+
+def _pack_chunks(pieces: List[str], max_chunk_size: int) -> List[str]:
+    """Greedily concatenate pieces into chunks of at most max_chunk_size characters"""
+    chunks: List[str] = []
+    current = ""
+    for piece in pieces:
+        if current and len(current) + len(piece) > max_chunk_size:
+            chunks.append(current)
+            current = piece
+        else:
+            current += piece
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+def _start_tag(element) -> str:
+    attrs = "".join(f' {name}="{html_escape(value)}"' for name, value in element.attrib.items())
+    return f"<{element.tag}{attrs}>"
+
+
+def _split_html_chunks(html_content: str, max_chunk_size: int) -> List[str]:
+    """
+    Split HTML into chunks of at most max_chunk_size characters along element boundaries,
+    so a <select> or a field's label/input pair is not cut in half between two prompts.
+    Elements that fit are kept whole and packed greedily. A larger element is split at its
+    children, and every chunk of it is wrapped in the element's own start/end tags, so its
+    attributes (form ids, fieldset names) stay in context and the chunk stays well-formed.
+    Text between children is kept. Only a childless element or text run longer than the
+    limit is sliced by characters. Falls back to plain slicing without lxml or for non-HTML input.
+    """
+    if len(html_content) <= max_chunk_size:
+        return [html_content]
+    if lxml_html is None or not html_content.lstrip().startswith('<'):
+        return _slice_chunks(html_content, max_chunk_size)
+
+    def split(element, limit: int) -> List[str]:
+        markup = lxml_html.tostring(element, encoding='unicode', with_tail=False)
+        children = list(element)
+        if len(markup) <= limit:
+            return [markup]
+        open_tag, close_tag = _start_tag(element), f"</{element.tag}>"
+        budget = limit - len(open_tag) - len(close_tag)
+        if not children or not isinstance(element.tag, str) or budget <= 0:
+            return _slice_chunks(markup, limit)
+        inner: List[str] = []
+        if element.text and element.text.strip():
+            inner.extend(_slice_chunks(html_escape(element.text, quote=False), budget))
+        for child in children:
+            inner.extend(split(child, budget))
+            if child.tail and child.tail.strip():
+                inner.extend(_slice_chunks(html_escape(child.tail, quote=False), budget))
+        return [open_tag + chunk + close_tag for chunk in _pack_chunks(inner, budget)]
+
+    try:
+        chunks = split(lxml_html.fromstring(html_content), max_chunk_size)
+    except Exception as e: # Malformed markup / parser errors: the byte split still works
+        logger.debug(f"Structural HTML split failed, slicing instead: {e}")
+        return _slice_chunks(html_content, max_chunk_size)
+    return chunks or _slice_chunks(html_content, max_chunk_size)
+
+# Path for the locator storage file (JSON Lines, one entry per line), relative to base_filler.py
+LOCATOR_STORAGE_FILE_PATH = Path(__file__).parent / "ai_identified_locators.jsonl"
+_LOCATOR_PATH_STR = str(LOCATOR_STORAGE_FILE_PATH)
+
+# Locator log entries are queued and written in batches by a background thread,
+# keeping file I/O out of the Selenium interaction loop.
+LOCATOR_FLUSH_INTERVAL = 1.0 # seconds
+LOCATOR_FLUSH_BATCH_SIZE = 50
+
+logger = logging.getLogger(__name__)
+
+_locator_queue: "queue.SimpleQueue[Dict[str, Any]]" = queue.SimpleQueue()
+_locator_flush_event = threading.Event()
+_locator_write_lock = threading.Lock()
+_locator_writer_thread: Optional[threading.Thread] = None
+
+
+def _write_locator_entries(entries: List[Dict[str, Any]]):
+    """Appends a batch of locator log entries to the JSON Lines storage file."""
+    # Append-only: a flush costs the size of the batch, not of the whole log
+    with open(_LOCATOR_PATH_STR, 'a', encoding='utf-8') as f:
+        f.write("".join(_dumps(entry) + "\n" for entry in entries))
+
+
+def flush_locator_log():
+    """Writes all queued locator log entries to disk. Safe to call from any thread."""
+    with _locator_write_lock:
+        entries = []
+        while True:
+            try:
+                entries.append(_locator_queue.get_nowait())
+            except queue.Empty:
+                break
+        if not entries:
+            return
+        try:
+            _write_locator_entries(entries)
+        except IOError as e:
+            logger.error(f"IOError writing to locator log file {LOCATOR_STORAGE_FILE_PATH}: {e}")
+        except Exception as e:
+            logger.error(f"Unexpected error writing to locator log file {LOCATOR_STORAGE_FILE_PATH}: {e}", exc_info=True)
+
+
+def _locator_writer_loop():
+    while True:
+        _locator_flush_event.wait(LOCATOR_FLUSH_INTERVAL)
+        _locator_flush_event.clear()
+        flush_locator_log()
+
+
+def _ensure_locator_writer():
+    """Starts the background locator writer once per process."""
+    global _locator_writer_thread
+    if _locator_writer_thread is not None:
+        return
+    with _locator_write_lock:
+        if _locator_writer_thread is None:
+            _locator_writer_thread = threading.Thread(target=_locator_writer_loop, name="locator-log-writer", daemon=True)
+            _locator_writer_thread.start()
+            atexit.register(flush_locator_log)
+
+# Parsed AI chunk responses, keyed by content hash and shared across processes
+LLM_CACHE_FILE_PATH = Path.home() / ".cache" / "job_automator" / "llm_cache.sqlite"
+
+
+def _content_hash(text: str) -> str:
+    return hashlib.blake2b(text.encode('utf-8'), digest_size=16).hexdigest()
+
+
+# Prompt fields that don't change an independent chunk's answer, so they stay out of its cache key
+_CHUNK_POSITION_FIELDS = ("chunk", "chunk_num", "total_chunks")
+
+
+def _llm_cache_key(prompt_template: str, chunk: str, prompt_fill_data: Dict[str, Any],
+                   exclude: Tuple[str, ...] = ("chunk",)) -> Tuple[str, str, str]:
+    """
+    (template hash, chunk hash, context hash) for one chunk prompt. Context covers every fill
+    value except those in exclude: profile, job (when the prompt has one), summary etc.
+    """
+    context = "\x00".join(f"{k}={v}" for k, v in sorted(prompt_fill_data.items()) if k not in exclude)
+    return _content_hash(prompt_template), _content_hash(chunk), _content_hash(context)
+
+
+class _LLMResponseCache:
+    """
+    SQLite-backed cache of parsed AI chunk responses. Failures disable the cache instead of raising.
+    The most recently used entries are also kept in memory (MEMORY_ENTRIES), so repeat lookups
+    within a run skip the database query and JSON parse.
+    """
+
+    MEMORY_ENTRIES = 256
+
+    def __init__(self, db_path: Path):
+        self.db_path = db_path
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        self._disabled = False
+        # key -> (created_at, parsed response), least recently used first
+        self._memory: "OrderedDict[Tuple[str, str, str], Tuple[float, Dict[str, Any]]]" = OrderedDict()
+
+    def _remember(self, key: Tuple[str, str, str], created_at: float, response: Dict[str, Any]):
+        """Add/refresh an in-memory entry (caller holds _lock)"""
+        self._memory[key] = (created_at, response)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.MEMORY_ENTRIES:
+            self._memory.popitem(last=False)
+
+    def _connection(self) -> Optional[sqlite3.Connection]:
+        if self._conn is None and not self._disabled:
+            try:
+                self.db_path.parent.mkdir(parents=True, exist_ok=True)
+                self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+                self._conn.execute(
+                    "CREATE TABLE IF NOT EXISTS llm_cache ("
+                    "template_hash TEXT, chunk_hash TEXT, context_hash TEXT, response TEXT, created_at REAL, "
+                    "PRIMARY KEY (template_hash, chunk_hash, context_hash))"
+                )
+                self._conn.commit()
+            except sqlite3.Error as e:
+                logger.warning(f"AI response cache unavailable at {self.db_path}: {e}")
+                self._disabled = True
+                self._conn = None
+        return self._conn
+
+    def get(self, key: Tuple[str, str, str], max_age: float) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            remembered = self._memory.get(key)
+            if remembered is not None and time.time() - remembered[0] <= max_age:
+                self._memory.move_to_end(key)
+                return remembered[1]
+            conn = self._connection()
+            if conn is None:
+                return None
+            try:
+                row = conn.execute(
+                    "SELECT response, created_at FROM llm_cache "
+                    "WHERE template_hash = ? AND chunk_hash = ? AND context_hash = ?", key
+                ).fetchone()
+            except sqlite3.Error as e:
+                logger.warning(f"AI response cache read failed: {e}")
+                return None
+        if not row or time.time() - row[1] > max_age:
+            return None
+        try:
+            response = _loads(row[0])
+        except json.JSONDecodeError:
+            return None
+        with self._lock:
+            self._remember(key, row[1], response)
+        return response
+
+    def put(self, key: Tuple[str, str, str], response: Dict[str, Any]):
+        with self._lock:
+            created_at = time.time()
+            self._remember(key, created_at, response)
+            conn = self._connection()
+            if conn is None:
+                return
+            try:
+                conn.execute("INSERT OR REPLACE INTO llm_cache VALUES (?, ?, ?, ?, ?)",
+                             (*key, _dumps(response), created_at))
+                conn.commit()
+            except (sqlite3.Error, TypeError) as e:
+                logger.warning(f"AI response cache write failed: {e}")
+
+
+_llm_response_cache = _LLMResponseCache(LLM_CACHE_FILE_PATH)
+
+
+def _form_analysis_cache_key(prompt_template: str, html_content: str, profile_json: str) -> Tuple[str, str, str]:
+    """
+    Key for the merged result of a job-independent form analysis: template, whitespace-
+    normalized HTML and profile, but not the job. Stored in the llm_cache table under a
+    'form:' prefixed template hash so it never collides with per-chunk entries.
+    """
+    normalized_html = " ".join(html_content.split())
+    return "form:" + _content_hash(prompt_template), _content_hash(normalized_html), _content_hash(profile_json)
+
+
+# Answers to custom application questions. ai_answer_question's prompt depends only on the
+# question, and the same questions ("Do you require sponsorship?") recur across jobs, so
+# answers are kept in an LRU keyed on the normalized question and saved to disk at exit.
+QA_CACHE_FILE_PATH = Path.home() / ".cache" / "job_automator" / "qa.json"
+QA_CACHE_MAX_ENTRIES = 512
+_qa_cache: Optional["OrderedDict[str, str]"] = None
+_qa_cache_dirty = False
+_qa_cache_lock = threading.Lock()
+
+
+def _normalize_question(question_text: str) -> str:
+    return ' '.join(question_text.lower().split())
+
+
+def _load_qa_cache() -> "OrderedDict[str, str]":
+    """Loads the on-disk answers on first use (caller holds _qa_cache_lock)."""
+    global _qa_cache
+    if _qa_cache is None:
+        _qa_cache = OrderedDict()
+        try:
+            with open(QA_CACHE_FILE_PATH, 'rb') as f:
+                data = _loads(f.read())
+            if isinstance(data, dict):
+                _qa_cache.update(list(data.items())[-QA_CACHE_MAX_ENTRIES:])
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError) as e:
+            logger.warning(f"Could not load Q&A cache {QA_CACHE_FILE_PATH}: {e}")
+        atexit.register(_save_qa_cache)
+    return _qa_cache
+
+
+def _qa_cache_get(key: str) -> Optional[str]:
+    with _qa_cache_lock:
+        cache = _load_qa_cache()
+        answer = cache.get(key)
+        if answer is not None:
+            cache.move_to_end(key)
+        return answer
+
+
+def _qa_cache_put(key: str, answer: str):
+    global _qa_cache_dirty
+    with _qa_cache_lock:
+        cache = _load_qa_cache()
+        cache[key] = answer
+        cache.move_to_end(key)
+        while len(cache) > QA_CACHE_MAX_ENTRIES:
+            cache.popitem(last=False)
+        _qa_cache_dirty = True
+
+
+def _save_qa_cache():
+    global _qa_cache_dirty
+    with _qa_cache_lock:
+        if _qa_cache is None or not _qa_cache_dirty:
+            return
+        try:
+            QA_CACHE_FILE_PATH.parent.mkdir(parents=True, exist_ok=True)
+            with open(QA_CACHE_FILE_PATH, 'w', encoding='utf-8') as f:
+                f.write(_dumps(dict(_qa_cache)))
+            _qa_cache_dirty = False
+        except OSError as e:
+            logger.warning(f"Could not save Q&A cache {QA_CACHE_FILE_PATH}: {e}")
 
 class ApplicationError(Exception):
     """Custom exception for application failures."""
@@ -50,6 +382,32 @@ class BaseFiller(ABC):
     MAX_AI_RETRIES = 2
     AI_RETRY_DELAY = 5 # seconds
     CACHE_EXPIRY_SECONDS = 3600 # 1 hour, adjust as needed
+    WAIT_POLL_FREQUENCY = 0.1 # WebDriverWait default is 0.5s; ATS form elements usually appear well under that
+    PERSISTENT_CACHE_EXPIRY_SECONDS = 7 * 24 * 3600 # On-disk chunk cache shared across runs
+    MAX_PARALLEL_AI_CHUNKS = 4 # Concurrent LLM requests when chunks are analyzed independently
+
+    # Scrolls arguments[0] into view only when it is outside the viewport; returns whether it scrolled
+    _SCROLL_IF_NEEDED_JS = (
+        "const r = arguments[0].getBoundingClientRect();"
+        "if (r.top >= 0 && r.bottom <= window.innerHeight) { return false; }"
+        "arguments[0].scrollIntoView(true); return true;"
+    )
+    # Sets (or appends to) an input's value through the native setter so framework-controlled
+    # inputs (React/Vue) see the change, then fires input/change. Returns false if not applicable.
+    _SET_VALUE_JS = (
+        "const el = arguments[0];"
+        "if (!('value' in el) || el.isContentEditable) { return false; }"
+        "const value = arguments[2] ? el.value + arguments[1] : arguments[1];"
+        "const desc = Object.getOwnPropertyDescriptor(Object.getPrototypeOf(el), 'value');"
+        "if (desc && desc.set) { desc.set.call(el, value); } else { el.value = value; }"
+        "el.dispatchEvent(new Event('input', {bubbles: true}));"
+        "el.dispatchEvent(new Event('change', {bubbles: true}));"
+        "return true;"
+    )
+    FAST_TYPE_MIN_LENGTH = 30 # Text this short keeps using send_keys
+    # Appended to multi-chunk prompts so the AI can stop the chunk loop early
+    AI_DONE_INSTRUCTION = ('\n\nIf this chunk already contains everything needed to answer and no further '
+                           'chunks need to be processed, add "done": true to your JSON response.')
 
     def __init__(self, driver: WebDriver, job_data: Dict, user_profile: Dict, 
                  document_paths: Dict[str, str], credentials: Optional[Dict] = None):
@@ -65,9 +423,22 @@ class BaseFiller(ABC):
         self.llm = get_llm_client()
         if not self.llm:
             self.logger.warning(f"{self.log_prefix}LLM client not available. AI functionalities will be limited.")
+        # JSON-mode client for analyze_large_html_with_ai; None means we parse ```json blocks from self.llm
+        self.json_llm = get_json_llm_client() if self.llm else None
             
         self._ai_cache = OrderedDict() # Simple in-memory cache
+        _ensure_locator_writer()
 
+        # Profile/job data don't change during an application, so serialize them once
+        # here instead of on every prompt.
+        self._profile_prompt_json = self._build_profile_json_for_prompt()
+        self._job_prompt_json = self._build_job_json_for_prompt()
+        skills = ', '.join(str(s) for s in (self.user_profile.get('skills') or [])[:3])
+        self._profile_summary_line = (
+            f"Relevant User Profile Info: Name - {self.user_profile.get('first_name', '')} {self.user_profile.get('last_name', '')}, "
+            f"Email - {self.user_profile.get('email', '')}, Phone - {self.user_profile.get('phone', '')}. Skills: {skills}."
+        )
+        self._job_summary_line = f"Applying for: {self.job_data.get('title', 'N/A')} at {self.job_data.get('company', 'N/A')}."
 
     def _log_ai_locator(self,
                         label: str,
@@ -76,8 +447,9 @@ class BaseFiller(ABC):
                         ats_platform: str,
                         job_id_str: Optional[str] = None):
         """
-        Logs an AI-identified locator to a JSON file.
+        Queues an AI-identified locator for the JSON log file.
         The locator is expected to be a list like ["id", "some_id"].
+        Entries are written in batches by the background writer (see flush_locator_log).
         """
         if not (isinstance(locator, (list, tuple)) and len(locator) == 2 and
                 isinstance(locator[0], str) and isinstance(locator[1], str)):
@@ -91,7 +463,7 @@ class BaseFiller(ABC):
 
 
         log_entry = {
-            "timestamp": datetime.utcnow().isoformat() + "Z", # UTC timestamp in ISO 8601 format
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec='milliseconds').replace('+00:00', 'Z'), # UTC, ISO 8601
             "job_id": job_id_str,
             "ats_platform": ats_platform,
             "page_context": context,
@@ -101,35 +473,9 @@ class BaseFiller(ABC):
             "source": "AI-generated"
         }
 
-        try:
-            data = []
-            if LOCATOR_STORAGE_FILE_PATH.exists() and LOCATOR_STORAGE_FILE_PATH.stat().st_size > 0:
-                with open(LOCATOR_STORAGE_FILE_PATH, 'r', encoding='utf-8') as f:
-                    try:
-                        data = json.load(f)
-                        if not isinstance(data, list):
-                            self.logger.warning(
-                                f"{self.log_prefix}Locator storage file {LOCATOR_STORAGE_FILE_PATH} "
-                                f"does not contain a list. Reinitializing."
-                            )
-                            data = []
-                    except json.JSONDecodeError:
-                        self.logger.warning(
-                            f"{self.log_prefix}Error decoding JSON from {LOCATOR_STORAGE_FILE_PATH}. "
-                            f"File might be corrupted. Reinitializing."
-                        )
-                        data = []
-            
-            data.append(log_entry)
-            
-            with open(LOCATOR_STORAGE_FILE_PATH, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=4)
-            # self.logger.info(f"{self.log_prefix}Logged AI locator for '{label}' in '{context}' to {LOCATOR_STORAGE_FILE_PATH.name}")
-
-        except IOError as e:
-            self.logger.error(f"{self.log_prefix}IOError writing to locator log file {LOCATOR_STORAGE_FILE_PATH}: {e}")
-        except Exception as e:
-            self.logger.error(f"{self.log_prefix}Unexpected error writing to locator log file {LOCATOR_STORAGE_FILE_PATH}: {e}", exc_info=True)
+        _locator_queue.put_nowait(log_entry)
+        if _locator_queue.qsize() >= LOCATOR_FLUSH_BATCH_SIZE:
+            _locator_flush_event.set()
 
     # ... (rest of your BaseFiller class, including analyze_large_html_with_ai, find_element, etc.)
     # Ensure find_element, type_text, click_element, select_dropdown_option, upload_file, navigate methods exist
@@ -159,67 +505,148 @@ class BaseFiller(ABC):
     def apply(self) -> str:
         pass
 
-    def _get_safe_profile_json_for_prompt(self) -> str:
-        # Placeholder: Implement or ensure this method exists and works.
-        # self.logger.debug(f"{self.log_prefix}BaseFiller: Using default _get_safe_profile_json_for_prompt.")
+    def _build_profile_json_for_prompt(self) -> str:
+        # Called once from __init__; subclasses override this to customise the serialization.
         try:
-            return json.dumps(self.user_profile)[:self.MAX_HTML_CHUNK_SIZE] # Basic serialization
+            return _dumps(self.user_profile)[:self.MAX_HTML_CHUNK_SIZE] # Basic serialization
         except TypeError:
             # Fallback for complex objects, ideally use a more robust serializer
-            return json.dumps(str(self.user_profile))[:self.MAX_HTML_CHUNK_SIZE]
-
+            return _dumps(str(self.user_profile))[:self.MAX_HTML_CHUNK_SIZE]
 
-    def _get_safe_job_json_for_prompt(self) -> str:
-        # Placeholder: Implement or ensure this method exists and works.
-        # self.logger.debug(f"{self.log_prefix}BaseFiller: Using default _get_safe_job_json_for_prompt.")
+    def _build_job_json_for_prompt(self) -> str:
         try:
-            return json.dumps(self.job_data)[:self.MAX_HTML_CHUNK_SIZE] # Basic serialization
+            return _dumps(self.job_data)[:self.MAX_HTML_CHUNK_SIZE] # Basic serialization
         except TypeError:
-            return json.dumps(str(self.job_data))[:self.MAX_HTML_CHUNK_SIZE]
+            return _dumps(str(self.job_data))[:self.MAX_HTML_CHUNK_SIZE]
+
+    def _get_safe_profile_json_for_prompt(self) -> str:
+        return self._profile_prompt_json
+
+    def _get_safe_job_json_for_prompt(self) -> str:
+        return self._job_prompt_json
+
+
+    def _request_chunk_analysis(self, current_prompt: str, chunk_num: int, total_chunks: int,
+                                chunk_size: int, cache_key: str) -> Tuple[Optional[Any], Optional[Dict[str, Any]]]:
+        """
+        Sends one chunk prompt to the LLM with retries and parses the JSON block from the reply.
+        Returns (parsed_response, None) on success or (None, error_dict) on failure.
+        """
+        for attempt in range(self.MAX_AI_RETRIES):
+            try:
+                self.logger.info(f"{self.log_prefix}Sending chunk {chunk_num}/{total_chunks} to AI for '{cache_key}'. Size: {chunk_size} chars.")
+                ai_response = (self.json_llm or self.llm).invoke(current_prompt) # Ensure this matches your LLM client's method
+
+                # Extract content, assuming response object has a 'content' attribute or similar
+                ai_response_content = getattr(ai_response, 'content', ai_response if isinstance(ai_response, str) else '')
+
+                # JSON mode returns the bare JSON document; parse it directly and only fall
+                # back to the ```json block extraction if that fails.
+                if self.json_llm:
+                    try:
+                        parsed_chunk_response = _loads(ai_response_content)
+                        self.logger.info(f"{self.log_prefix}Successfully processed AI response for chunk {chunk_num}/{total_chunks}.")
+                        return parsed_chunk_response, None
+                    except (json.JSONDecodeError, TypeError, ValueError):
+                        pass
+
+                # Attempt to find JSON within ```json ``` markers
+                json_match = re.search(r"```json\s*([\s\S]*?)\s*```", ai_response_content, re.DOTALL)
+                if json_match:
+                    json_str = json_match.group(1).strip()
+                    try:
+                        parsed_chunk_response = _loads(json_str)
+                        self.logger.info(f"{self.log_prefix}Successfully processed AI response for chunk {chunk_num}/{total_chunks}.")
+                        return parsed_chunk_response, None
+                    except json.JSONDecodeError as e_json:
+                        self.logger.warning(f"{self.log_prefix}AI response JSON parsing failed for chunk {chunk_num} (attempt {attempt+1}): {e_json}. Response snippet: {json_str[:200]}...")
+                        if attempt + 1 >= self.MAX_AI_RETRIES:
+                            self.logger.error(f"{self.log_prefix}Max retries reached for chunk {chunk_num}. Failed to parse JSON.")
+                            return None, {"error": f"AI JSON parsing error after max retries for chunk {chunk_num}: {e_json}", "raw_response": json_str}
+                else:
+                    self.logger.warning(f"{self.log_prefix}No JSON block found in AI response for chunk {chunk_num} (attempt {attempt+1}). Response: {ai_response_content[:200]}...")
+                    if attempt + 1 >= self.MAX_AI_RETRIES:
+                        self.logger.error(f"{self.log_prefix}Max retries reached for chunk {chunk_num}. No JSON block found.")
+                        return None, {"error": f"AI response format error (no JSON block) after max retries for chunk {chunk_num}", "raw_response": ai_response_content}
+
+            except Exception as e_llm:
+                self.logger.error(f"{self.log_prefix}LLM invocation failed for chunk {chunk_num} (attempt {attempt+1}): {e_llm}", exc_info=True)
+                if attempt + 1 >= self.MAX_AI_RETRIES:
+                    self.logger.error(f"{self.log_prefix}Max retries reached for LLM invocation on chunk {chunk_num}.")
+                    return None, {"error": f"LLM error after max retries for chunk {chunk_num}: {e_llm}"}
 
+            if attempt + 1 < self.MAX_AI_RETRIES:
+                self.logger.info(f"{self.log_prefix}Retrying AI analysis for chunk {chunk_num} in {self.AI_RETRY_DELAY}s...")
+                time.sleep(self.AI_RETRY_DELAY)
+
+        return None, {"error": f"Failed to process chunk {chunk_num} after all retries."}
+
+    def _cached_ai_analysis(self, cache_key: str) -> Optional[Dict[str, Any]]:
+        """
+        In-memory result of an earlier analyze_large_html_with_ai call for cache_key, or None.
+        Callers can check this before collecting the page HTML the analysis would need.
+        """
+        cached_item = self._ai_cache.get(cache_key)
+        if cached_item is None:
+            return None
+        if time.time() - cached_item['timestamp'] < self.CACHE_EXPIRY_SECONDS:
+            self.logger.info(f"{self.log_prefix}Using cached AI analysis for '{cache_key}'.")
+            return cached_item['data']
+        self.logger.info(f"{self.log_prefix}Cache expired for '{cache_key}'. Re-analyzing.")
+        del self._ai_cache[cache_key] # Remove expired entry
+        return None
 
     def analyze_large_html_with_ai(self, html_content: str, prompt_template: str, cache_key: str,
                                    max_chunk_size: Optional[int] = None,
-                                   context_data: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+                                   context_data: Optional[Dict[str, Any]] = None,
+                                   independent_chunks: bool = False,
+                                   job_independent: bool = False) -> Dict[str, Any]:
         """
         Analyzes large HTML content by chunking it and processing with an LLM.
         Includes caching, retries, and structured JSON output expectation.
+
+        By default chunks are processed in order and each prompt receives the summary of the
+        previous chunk. With independent_chunks=True the prompts do not depend on each other,
+        so all chunks are sent to the LLM concurrently and the results merged in chunk order.
+
+        job_independent=True is for prompts that only extract the form's structure and profile
+        values: the job is not passed to the template (which must not use {job}), so the
+        persistent cache entries are shared by every posting that uses the same form. The merged
+        result is cached as a whole too, so an identical form skips chunking and merging.
         """
         if not self.llm:
             self.logger.error(f"{self.log_prefix}LLM client not available for AI analysis.")
             return {"error": "LLM client not available."}
 
-        if cache_key in self._ai_cache:
-            cached_item = self._ai_cache[cache_key]
-            if time.time() - cached_item['timestamp'] < self.CACHE_EXPIRY_SECONDS:
-                self.logger.info(f"{self.log_prefix}Using cached AI analysis for '{cache_key}'.")
-                return cached_item['data']
-            else:
-                self.logger.info(f"{self.log_prefix}Cache expired for '{cache_key}'. Re-analyzing.")
-                del self._ai_cache[cache_key] # Remove expired entry
+        cached = self._cached_ai_analysis(cache_key)
+        if cached is not None:
+            return cached
 
         max_chunk_size = max_chunk_size or self.MAX_HTML_CHUNK_SIZE
         
         profile_json = self._get_safe_profile_json_for_prompt()
-        job_json = self._get_safe_job_json_for_prompt()
+
+        form_cache_key = _form_analysis_cache_key(prompt_template, html_content, profile_json) if job_independent else None
+        if form_cache_key:
+            shared_result = _llm_response_cache.get(form_cache_key, self.PERSISTENT_CACHE_EXPIRY_SECONDS)
+            if shared_result is not None:
+                self.logger.info(f"{self.log_prefix}Using cached analysis of an identical form for '{cache_key}'.")
+                self._ai_cache[cache_key] = {'timestamp': time.time(), 'data': shared_result}
+                return shared_result
 
         # Add profile and job to the context_data if not already overridden by caller
-        final_context_data = {
-            "profile": profile_json,
-            "job": job_json,
-            **(context_data or {}) 
-        }
+        final_context_data = {"profile": profile_json}
+        if not job_independent:
+            final_context_data["job"] = self._get_safe_job_json_for_prompt()
+        final_context_data.update(context_data or {})
 
-        chunks = [html_content[i:i + max_chunk_size] for i in range(0, len(html_content), max_chunk_size)]
+        chunks = _split_html_chunks(html_content, max_chunk_size)
         aggregated_results = {"fields": [], "questions": [], "summary": "Initial chunk."} # Ensure keys exist
-        
-        final_parsed_response = {}
+        parallel = independent_chunks and len(chunks) > 1
+        # An independent chunk's answer doesn't depend on where it sits in the form
+        key_exclude = _CHUNK_POSITION_FIELDS if parallel else ("chunk",)
 
-        for i, chunk in enumerate(chunks):
-            attempt = 0
-            success = False
-            current_summary = aggregated_results.get("summary", f"Summary from previous {i} chunks.")
-            
+        def build_prompt(i: int, chunk: str, current_summary: str):
             # Prepare prompt with all available context
             prompt_fill_data = {
                 "chunk": chunk,
@@ -228,79 +655,87 @@ class BaseFiller(ABC):
                 "total_chunks": len(chunks),
                 **final_context_data # Includes profile, job, and any other context
             }
-            
-            # Ensure all placeholders in prompt_template are present in prompt_fill_data
+            current_prompt = prompt_template.format(**prompt_fill_data)
+            if not parallel and i + 1 < len(chunks): # Only worth asking when there are chunks left to skip
+                current_prompt += self.AI_DONE_INSTRUCTION
+            return current_prompt, _llm_cache_key(prompt_template, chunk, prompt_fill_data, key_exclude)
+
+        def merge(parsed_chunk_response: Any, current_summary: str):
+            # Merge results (example for "fields" and "questions")
+            if "fields" in parsed_chunk_response and isinstance(parsed_chunk_response["fields"], list):
+                aggregated_results["fields"].extend(parsed_chunk_response["fields"])
+            if "questions" in parsed_chunk_response and isinstance(parsed_chunk_response["questions"], list):
+                aggregated_results["questions"].extend(parsed_chunk_response["questions"])
+            # Other keys (e.g. a single located element): the first chunk with a value wins
+            for key, value in parsed_chunk_response.items():
+                if key not in ("fields", "questions", "summary", "done") and value is not None:
+                    aggregated_results.setdefault(key, value)
+            # Update summary from the current chunk's analysis
+            aggregated_results["summary"] = parsed_chunk_response.get("summary", current_summary)
+
+        if parallel:
+            independent_summary = "Not available: chunks are analyzed independently."
             try:
-                current_prompt = prompt_template.format(**prompt_fill_data)
+                prompts = [build_prompt(i, chunk, independent_summary) for i, chunk in enumerate(chunks)]
             except KeyError as e:
-                self.logger.error(f"{self.log_prefix}Missing key for prompt template: {e}. Available keys: {prompt_fill_data.keys()}")
+                self.logger.error(f"{self.log_prefix}Missing key for prompt template: {e}.")
                 return {"error": f"Prompt template formatting error, missing key: {e}"}
 
-
-            while attempt < self.MAX_AI_RETRIES and not success:
+            # Identical chunk + prompt + context may already have been answered (possibly by another run)
+            responses = [_llm_response_cache.get(key, self.PERSISTENT_CACHE_EXPIRY_SECONDS) for _, key in prompts]
+            pending = [i for i, response in enumerate(responses) if response is None]
+            if len(pending) < len(chunks):
+                self.logger.info(f"{self.log_prefix}Using persistent AI cache for {len(chunks) - len(pending)}/{len(chunks)} chunks of '{cache_key}'.")
+            if pending:
+                self.logger.info(f"{self.log_prefix}Dispatching {len(pending)} independent chunks concurrently for '{cache_key}'.")
+                with ThreadPoolExecutor(max_workers=min(self.MAX_PARALLEL_AI_CHUNKS, len(pending))) as executor:
+                    results = list(executor.map(
+                        lambda i: self._request_chunk_analysis(prompts[i][0], i + 1, len(chunks), len(chunks[i]), cache_key),
+                        pending
+                    ))
+                for i, (parsed_chunk_response, error) in zip(pending, results):
+                    if error:
+                        return error
+                    _llm_response_cache.put(prompts[i][1], parsed_chunk_response)
+                    responses[i] = parsed_chunk_response
+            for parsed_chunk_response in responses:
+                merge(parsed_chunk_response, aggregated_results["summary"])
+        else:
+            for i, chunk in enumerate(chunks):
+                current_summary = aggregated_results.get("summary", f"Summary from previous {i} chunks.")
                 try:
-                    self.logger.info(f"{self.log_prefix}Sending chunk {i+1}/{len(chunks)} to AI for '{cache_key}'. Size: {len(chunk)} chars.")
-                    ai_response = self.llm.invoke(current_prompt) # Ensure this matches your LLM client's method
-                    
-                    # Extract content, assuming response object has a 'content' attribute or similar
-                    ai_response_content = getattr(ai_response, 'content', ai_response if isinstance(ai_response, str) else '')
-                    
-                    # Attempt to find JSON within ```json ``` markers
-                    json_match = re.search(r"```json\s*([\s\S]*?)\s*```", ai_response_content, re.DOTALL)
-                    if json_match:
-                        json_str = json_match.group(1).strip()
-                        try:
-                            parsed_chunk_response = json.loads(json_str)
-                            # Merge results (example for "fields" and "questions")
-                            if "fields" in parsed_chunk_response and isinstance(parsed_chunk_response["fields"], list):
-                                aggregated_results["fields"].extend(parsed_chunk_response["fields"])
-                            if "questions" in parsed_chunk_response and isinstance(parsed_chunk_response["questions"], list):
-                                aggregated_results["questions"].extend(parsed_chunk_response["questions"])
-                            
-                            # Update summary from the current chunk's analysis
-                            aggregated_results["summary"] = parsed_chunk_response.get("summary", current_summary)
-                            
-                            # Store the last valid complete JSON response structure
-                            final_parsed_response = parsed_chunk_response 
-                            
-                            success = True
-                            self.logger.info(f"{self.log_prefix}Successfully processed AI response for chunk {i+1}/{len(chunks)}.")
-                        except json.JSONDecodeError as e_json:
-                            self.logger.warning(f"{self.log_prefix}AI response JSON parsing failed for chunk {i+1} (attempt {attempt+1}): {e_json}. Response snippet: {json_str[:200]}...")
-                            if attempt + 1 >= self.MAX_AI_RETRIES:
-                                self.logger.error(f"{self.log_prefix}Max retries reached for chunk {i+1}. Failed to parse JSON.")
-                                return {"error": f"AI JSON parsing error after max retries for chunk {i+1}: {e_json}", "raw_response": json_str}
-                    else:
-                        self.logger.warning(f"{self.log_prefix}No JSON block found in AI response for chunk {i+1} (attempt {attempt+1}). Response: {ai_response_content[:200]}...")
-                        if attempt + 1 >= self.MAX_AI_RETRIES:
-                            self.logger.error(f"{self.log_prefix}Max retries reached for chunk {i+1}. No JSON block found.")
-                            return {"error": f"AI response format error (no JSON block) after max retries for chunk {i+1}", "raw_response": ai_response_content}
+                    current_prompt, chunk_cache_key = build_prompt(i, chunk, current_summary)
+                except KeyError as e:
+                    self.logger.error(f"{self.log_prefix}Missing key for prompt template: {e}.")
+                    return {"error": f"Prompt template formatting error, missing key: {e}"}
 
-                except Exception as e_llm:
-                    self.logger.error(f"{self.log_prefix}LLM invocation failed for chunk {i+1} (attempt {attempt+1}): {e_llm}", exc_info=True)
-                    if attempt + 1 >= self.MAX_AI_RETRIES:
-                        self.logger.error(f"{self.log_prefix}Max retries reached for LLM invocation on chunk {i+1}.")
-                        return {"error": f"LLM error after max retries for chunk {i+1}: {e_llm}"}
-                
-                if not success:
-                    attempt += 1
-                    if attempt < self.MAX_AI_RETRIES:
-                        self.logger.info(f"{self.log_prefix}Retrying AI analysis for chunk {i+1} in {self.AI_RETRY_DELAY}s...")
-                        time.sleep(self.AI_RETRY_DELAY)
-            
-            if not success: # Should not happen if error returns are proper
-                return {"error": f"Failed to process chunk {i+1} after all retries."}
+                # Identical chunk + prompt + context was already answered (possibly by another run)
+                parsed_chunk_response = _llm_response_cache.get(chunk_cache_key, self.PERSISTENT_CACHE_EXPIRY_SECONDS)
+                if parsed_chunk_response is not None:
+                    self.logger.info(f"{self.log_prefix}Using persistent AI cache for chunk {i+1}/{len(chunks)} of '{cache_key}'.")
+                else:
+                    parsed_chunk_response, error = self._request_chunk_analysis(current_prompt, i + 1, len(chunks), len(chunk), cache_key)
+                    if error:
+                        return error
+                    _llm_response_cache.put(chunk_cache_key, parsed_chunk_response)
+
+                merge(parsed_chunk_response, current_summary)
+
+                if parsed_chunk_response.get("done") and i + 1 < len(chunks):
+                    self.logger.info(f"{self.log_prefix}AI signalled completion after chunk {i+1}/{len(chunks)}. Skipping remaining chunks.")
+                    break
 
         # After processing all chunks, the 'aggregated_results' should contain the combined data.
         # Or, if the AI is designed to return the full structure in the last chunk based on summary:
-        # Use final_parsed_response which holds the JSON from the last successful chunk.
+        # Use the JSON from the last successful chunk.
         # For this implementation, let's assume aggregated_results is what we want.
         # If the prompt asks the AI to consolidate, then the last chunk's response might be more appropriate.
         # Based on typical chunked summarization, aggregated_results is more robust if fields are additive.
-        # If the AI's role is to produce ONE final JSON by the end, use `final_parsed_response`.
         # Given the prompt examples which seem to have `fields` and `questions` lists, aggregation is suitable.
 
         self._ai_cache[cache_key] = {'timestamp': time.time(), 'data': aggregated_results}
+        if form_cache_key:
+            _llm_response_cache.put(form_cache_key, aggregated_results)
         # Manage cache size (optional, simple LRU-like behavior by removing oldest)
         while len(self._ai_cache) > 10: # Example cache size limit
             self._ai_cache.popitem(last=False)
@@ -313,7 +748,7 @@ class BaseFiller(ABC):
         """Finds a web element with explicit wait, logging, and error handling."""
         name_for_log = element_name or f"element by {locator[0]}='{locator[1]}'"
         try:
-            element = WebDriverWait(self.driver, wait_time).until(
+            element = WebDriverWait(self.driver, wait_time, poll_frequency=self.WAIT_POLL_FREQUENCY).until(
                 EC.presence_of_element_located(locator)
             )
             # self.logger.debug(f"{self.log_prefix}Found {name_for_log}.")
@@ -337,7 +772,7 @@ class BaseFiller(ABC):
         element_desc = desc or (f"element by {locator[0]}='{locator[1]}'" if isinstance(locator, tuple) else "provided element")
         try:
             if isinstance(locator, tuple):
-                web_element = WebDriverWait(self.driver, wait_time).until(
+                web_element = WebDriverWait(self.driver, wait_time, poll_frequency=self.WAIT_POLL_FREQUENCY).until(
                     EC.element_to_be_clickable(locator)
                 )
             elif isinstance(locator, WebElement):
@@ -349,8 +784,9 @@ class BaseFiller(ABC):
 
             if scroll_into_view:
                 try:
-                    self.driver.execute_script("arguments[0].scrollIntoView(true);", web_element)
-                    time.sleep(0.3) # Short pause for scroll to complete
+                    # Single round-trip: only scrolls (and only then pauses) if the element is off-screen
+                    if self.driver.execute_script(self._SCROLL_IF_NEEDED_JS, web_element):
+                        time.sleep(0.3) # Short pause for scroll to complete
                 except Exception as e_scroll:
                     self.logger.warning(f"{self.log_prefix}Could not scroll {element_desc} into view: {e_scroll}")
             
@@ -360,14 +796,18 @@ class BaseFiller(ABC):
         except (ElementClickInterceptedException, ElementNotInteractableException) as e_interact:
             self.logger.warning(f"{self.log_prefix}Standard click failed for {element_desc}: {e_interact}. Trying JavaScript click.")
             try:
-                if not isinstance(locator, WebElement): # Re-fetch if locator was a tuple
-                     web_element = self.find_element(locator, wait_time=3, fatal=False, element_name=element_desc) # type: ignore
-                if web_element:
+                # web_element is already bound; only re-fetch if it went stale in the meantime
+                try:
                     self.driver.execute_script("arguments[0].click();", web_element)
-                    # self.logger.info(f"{self.log_prefix}Clicked {element_desc} using JavaScript.")
-                    return True
-                else:
-                    raise e_interact # Could not re-find element
+                except StaleElementReferenceException:
+                    if isinstance(locator, WebElement):
+                        raise
+                    web_element = self.find_element(locator, wait_time=3, fatal=False, element_name=element_desc) # type: ignore
+                    if not web_element:
+                        raise e_interact # Could not re-find element
+                    self.driver.execute_script("arguments[0].click();", web_element)
+                # self.logger.info(f"{self.log_prefix}Clicked {element_desc} using JavaScript.")
+                return True
             except Exception as e_js:
                 self.logger.error(f"{self.log_prefix}JavaScript click also failed for {element_desc}: {e_js}")
                 if fatal: raise ApplicationError(f"Failed to click {element_desc}: {e_js}")
@@ -383,13 +823,21 @@ class BaseFiller(ABC):
             self.logger.warning(f"{self.log_prefix}{msg} (non-fatal)", exc_info=True)
             return False
 
-    def type_text(self, locator: Tuple[str, str], text: str, desc: Optional[str] = None,
+    def type_text(self, locator: Union[Tuple[str, str], WebElement], text: str, desc: Optional[str] = None,
                   wait_time: int = 10, clear_first: bool = True, fatal: bool = True,
-                  click_before_type: bool = True) -> bool:
-        """Types text into an element with wait, clear, logging, and error handling."""
-        element_desc = desc or f"input field by {locator[0]}='{locator[1]}'"
+                  click_before_type: bool = True, use_keystrokes: bool = False) -> bool:
+        """
+        Types text into an element with wait, clear, logging, and error handling.
+        Text longer than FAST_TYPE_MIN_LENGTH is set in one JS call (with input/change events
+        dispatched) instead of per-key send_keys; short values are typed normally. Pass
+        use_keystrokes=True for widgets that only react to real key events (autocompletes).
+        """
+        element_desc = desc or (f"input field by {locator[0]}='{locator[1]}'" if isinstance(locator, tuple) else "provided input field")
         try:
-            element = self.find_element(locator, wait_time=wait_time, fatal=False, element_name=element_desc)
+            if isinstance(locator, WebElement):
+                element = locator # Already resolved by the caller
+            else:
+                element = self.find_element(locator, wait_time=wait_time, fatal=False, element_name=element_desc)
             if not element:
                 if fatal: raise ApplicationError(f"{element_desc} not found for typing.")
                 return False
@@ -398,6 +846,11 @@ class BaseFiller(ABC):
                 self.driver.execute_script("arguments[0].click();", element) # JS click to ensure focus
                 time.sleep(0.2)
 
+            if len(text) > self.FAST_TYPE_MIN_LENGTH and not use_keystrokes:
+                if self.driver.execute_script(self._SET_VALUE_JS, element, text, not clear_first):
+                    return True
+                # Element has no settable value (e.g. contenteditable); fall back to keystrokes
+
             if clear_first:
                 element.send_keys(Keys.CONTROL + "a" if sys.platform == "darwin" else Keys.CONTROL + "a") # Select all
                 element.send_keys(Keys.DELETE)
@@ -413,13 +866,16 @@ class BaseFiller(ABC):
             self.logger.warning(f"{self.log_prefix}{msg} (non-fatal)", exc_info=True)
             return False
 
-    def select_dropdown_option(self, locator: Tuple[str, str], option_text: Optional[str] = None,
+    def select_dropdown_option(self, locator: Union[Tuple[str, str], WebElement], option_text: Optional[str] = None,
                                option_value: Optional[str] = None, desc: Optional[str] = None,
                                wait_time: int = 10, fatal: bool = True) -> bool:
         """Selects an option in a dropdown by visible text or value."""
-        element_desc = desc or f"dropdown by {locator[0]}='{locator[1]}'"
+        element_desc = desc or (f"dropdown by {locator[0]}='{locator[1]}'" if isinstance(locator, tuple) else "provided dropdown")
         try:
-            select_element = self.find_element(locator, wait_time=wait_time, fatal=False, element_name=element_desc)
+            if isinstance(locator, WebElement):
+                select_element = locator # Already resolved by the caller
+            else:
+                select_element = self.find_element(locator, wait_time=wait_time, fatal=False, element_name=element_desc)
             if not select_element:
                 if fatal: raise ApplicationError(f"{element_desc} (select element) not found.")
                 return False
@@ -447,10 +903,10 @@ class BaseFiller(ABC):
             self.logger.warning(f"{self.log_prefix}{msg} (non-fatal)", exc_info=True)
             return False
             
-    def upload_file(self, locator: Tuple[str, str], file_path: str, desc: Optional[str] = None,
+    def upload_file(self, locator: Union[Tuple[str, str], WebElement], file_path: str, desc: Optional[str] = None,
                     wait_time: int = 10, fatal: bool = True) -> bool:
         """Uploads a file to a file input element."""
-        element_desc = desc or f"file input by {locator[0]}='{locator[1]}'"
+        element_desc = desc or (f"file input by {locator[0]}='{locator[1]}'" if isinstance(locator, tuple) else "provided file input")
         
         resolved_file_path = str(Path(file_path).resolve())
         if not Path(resolved_file_path).exists():
@@ -461,9 +917,12 @@ class BaseFiller(ABC):
         try:
             # File inputs are often not visible or interactable directly for EC.element_to_be_clickable
             # EC.presence_of_element_located is usually sufficient for send_keys to work
-            file_input = WebDriverWait(self.driver, wait_time).until(
-                EC.presence_of_element_located(locator)
-            )
+            if isinstance(locator, WebElement):
+                file_input = locator # Already resolved by the caller
+            else:
+                file_input = WebDriverWait(self.driver, wait_time, poll_frequency=self.WAIT_POLL_FREQUENCY).until(
+                    EC.presence_of_element_located(locator)
+                )
             file_input.send_keys(resolved_file_path)
             # self.logger.info(f"{self.log_prefix}Uploaded file '{Path(resolved_file_path).name}' to {element_desc}.")
             time.sleep(1) # Give a moment for the upload to register on the UI
@@ -484,7 +943,7 @@ class BaseFiller(ABC):
         try:
             self.driver.get(url)
             self.logger.info(f"{self.log_prefix}Navigated to {url}.")
-            WebDriverWait(self.driver, 15).until(lambda d: d.execute_script('return document.readyState') == 'complete')
+            WebDriverWait(self.driver, 15, poll_frequency=self.WAIT_POLL_FREQUENCY).until(lambda d: d.execute_script('return document.readyState') == 'complete')
             return True
         except WebDriverException as e:
             self.logger.error(f"{self.log_prefix}WebDriverException during navigation to {url}: {e}", exc_info=True)
@@ -501,8 +960,8 @@ class BaseFiller(ABC):
             return "Not Available (LLM Error)" if is_required else None
 
         try:
-            profile_summary = f"Relevant User Profile Info: Name - {self.user_profile.get('first_name', '')} {self.user_profile.get('last_name', '')}, Email - {self.user_profile.get('email', '')}, Phone - {self.user_profile.get('phone', '')}. Skills: {', '.join(self.user_profile.get('skills', [])[:3])}."
-            job_summary = f"Applying for: {self.job_data.get('title', 'N/A')} at {self.job_data.get('company', 'N/A')}."
+            profile_summary = self._profile_summary_line
+            job_summary = self._job_summary_line
 
             prompt = (
                 f"You are an assistant helping fill out a job application. "
@@ -532,11 +991,26 @@ class BaseFiller(ABC):
             return None
 
     def ai_answer_question(self, question_text: str) -> str:
-        """Uses AI to generate an answer for a custom question."""
-        self.logger.info(f"{self.log_prefix}Generating AI answer for: '{question_text[:60]}...'")
+        """Uses AI to generate an answer for a custom question (cached across jobs and runs)."""
+        cache_key = _normalize_question(question_text)
+        cached_answer = _qa_cache_get(cache_key)
+        if cached_answer is not None:
+            self.logger.info(f"{self.log_prefix}Using cached AI answer for: '{question_text[:60]}...'")
+            return cached_answer
+
         if not self.llm: 
             return "Not Available (LLM Error)"
-            
+
+        answer = self._generate_ai_answer_uncached(question_text)
+        if answer is None:
+            return "Error generating answer."
+        if answer:  # Empty replies are not cached
+            _qa_cache_put(cache_key, answer)
+        return answer or "Not Applicable."
+
+    def _generate_ai_answer_uncached(self, question_text: str) -> Optional[str]:
+        """Asks the LLM; returns the answer, "" for an empty reply, or None on error."""
+        self.logger.info(f"{self.log_prefix}Generating AI answer for: '{question_text[:60]}...'")
         try:
             prompt = (
                 f"Answer the following job application question concisely and professionally, "
@@ -546,10 +1020,10 @@ class BaseFiller(ABC):
             response = self.llm.invoke(prompt)
             answer = getattr(response, 'content', '')
             self.logger.info(f"{self.log_prefix}Generated AI answer snippet: {answer[:60]}...")
-            return answer or "Not Applicable."
+            return answer
         except Exception as e:
             self.logger.error(f"{self.log_prefix}LLM invocation failed for question: {e}")
-            return "Error generating answer."
+            return None
 
 
 # Placeholder for re (regular expression) import, if not already present at the top of base_filler.py
@@ -5,25 +5,408 @@ Uses persistent browser session via BrowserUseSessionManager
 
 import logging
 import asyncio
+import atexit
+import functools
+import json
+import os
+import random
+import re
+import string
+import threading
 from pathlib import Path
-from typing import Dict, Optional
-import sys
-
-# Add parent directory to path for imports
-from pathlib import Path
-sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from typing import Dict, List, Optional, Set, Tuple
+from urllib.parse import urlparse
 
 try:
-    from browser_use_manager import BrowserUseSessionManager, BROWSER_USE_AVAILABLE
+    from ..browser_use_manager import BrowserUseSessionManager, BROWSER_USE_AVAILABLE
 except ImportError:
-    try:
-        from ..browser_use_manager import BrowserUseSessionManager, BROWSER_USE_AVAILABLE
-    except ImportError:
-        BROWSER_USE_AVAILABLE = False
-        BrowserUseSessionManager = None
+    BROWSER_USE_AVAILABLE = False
+    BrowserUseSessionManager = None
+
+from ..ats_identifier import identify_ats_platform
 
 import config
 
+logger = logging.getLogger(__name__)
+
+# agent.run() errors worth retrying: LLM timeouts, rate limits, transient server errors
+# and dropped connections. Anything else fails immediately. One precompiled pattern,
+# case-insensitive, so the error text is scanned once and never lowercased.
+_TIMEOUT_RE = re.compile(r'timeout|timed out|60\s*seconds', re.IGNORECASE)
+_RETRYABLE_ERROR_RE = re.compile(
+    _TIMEOUT_RE.pattern
+    + r'|\b(?:429|500|502|503|504)\b|rate limit|resource exhausted|quota'
+    + r'|unavailable|overloaded|connection',
+    re.IGNORECASE,
+)
+_RATE_LIMIT_RE = re.compile(r'\b429\b|rate limit|resource exhausted|quota', re.IGNORECASE)
+_RETRY_DELAY_CAP_SECONDS = 60
+# Backoff base: rate limits last longer than a dropped connection, so start them higher
+_RETRY_BASE_SECONDS = 1
+_RATE_LIMIT_RETRY_BASE_SECONDS = 5
+# Longest server-requested wait we honour (Retry-After / Gemini's retryDelay)
+_RETRY_AFTER_MAX_SECONDS = 300
+# Gemini 429 payloads carry the wait in the message, e.g. "retryDelay': '23s'" or "retry in 23.5s"
+_RETRY_HINT_RE = re.compile(r"retry(?:[_ ]?delay|[_ -]after| in)['\"]?\s*[:=]?\s*['\"]?(\d+(?:\.\d+)?)\s*s", re.IGNORECASE)
+
+# Keyword sets for _is_application_successful (lowercase, no punctuation), compiled into
+# one tagged alternation so an agent result (possibly a long trace) is scanned once
+_SUCCESS_KEYWORDS = (
+    'application submitted',
+    'successfully submitted',
+    'successfully applied',
+    'thank you for applying',
+    'application received',
+    'application complete',
+    'confirmation',
+    'we have received your application',
+)
+_FAILURE_KEYWORDS = (
+    'error',
+    'failed',
+    'could not submit',
+    'unable to',
+    'captcha',
+    'verification required',
+)
+# Failure alternatives come first, so at a given position a failure keyword wins
+_RESULT_RE = re.compile('(?P<fail>%s)|(?P<ok>%s)' % ('|'.join(map(re.escape, _FAILURE_KEYWORDS)),
+                                                       '|'.join(map(re.escape, _SUCCESS_KEYWORDS))))
+# Unambiguous submission wording (matched on normalized text) for stopping a run mid-way.
+# Stricter than _SUCCESS_KEYWORDS: a step that merely fills an "Email confirmation" field or
+# reads "you will receive a confirmation email" must not end the run before submitting.
+_SUBMISSION_CONFIRMED_RE = re.compile(
+    r'\bapplication (?:has been |was )?(?:successfully )?(?:submitted|received)\b'
+    r'|\bthank you for (?:applying|your application)\b'
+    r'|\bwe (?:have |ve )?received your application\b'
+    r'|\bsuccessfully (?:submitted|applied)\b'
+)
+# Blockers the agent cannot get past; seeing one mid-run ends the run instead of burning steps.
+# Only actual challenge states: the bare word "captcha" is also in the "This site is protected
+# by reCAPTCHA" footer that Greenhouse/Lever render on every normal form.
+_TERMINAL_FAILURE_RE = re.compile(
+    r'\b(?:complete|solve) the (?:re)?captcha\b'
+    r'|\b(?:re)?captcha (?:failed|required|verification failed)\b'
+    r'|\bverify (?:that )?you are (?:a )?human\b'
+    r'|\bare you a robot\b'
+    r'|\bverification required\b'
+)
+# Results are lowercased and have punctuation folded to spaces before matching, so
+# "Thank-you for applying!" or "application_submitted" hit the same keywords
+_PUNCT_TABLE = str.maketrans({c: ' ' for c in "-_,.;:!?"})
+_WS_RE = re.compile(r'\s+')
+
+
+# Documents offered to the agent for upload: (label for logs, document_paths key)
+_UPLOAD_DOCUMENTS = (('Resume', 'resume'), ('Cover letter', 'cover_letter'))
+
+# How much of a stringified agent history is scanned when it has no final message;
+# the confirmation (or last error) is at the end, the rest is step/DOM dumps
+_RESULT_SCAN_TAIL_CHARS = 8192
+
+
+def _normalize_result_text(text: str) -> str:
+    """Lowercase, punctuation folded to spaces, whitespace collapsed (see _PUNCT_TABLE)"""
+    return _WS_RE.sub(' ', text.lower().translate(_PUNCT_TABLE))
+
+
+def _result_text(result) -> str:
+    """The part of an agent result worth scanning: its final message, else the tail of str(result)"""
+    final_result = getattr(result, 'final_result', None)
+    if callable(final_result):
+        try:
+            final_text = final_result()
+        except Exception:
+            final_text = None
+        if final_text:
+            return str(final_text)
+    return str(result)[-_RESULT_SCAN_TAIL_CHARS:]
+
+
+def _agent_output_text(result) -> str:
+    """
+    Only what the agent itself wrote: its final message plus the extracted content of each
+    step. Unlike str(result), never includes the task prompt.
+    """
+    parts = []
+    for attr in ('final_result', 'extracted_content'):
+        method = getattr(result, attr, None)
+        if not callable(method):
+            continue
+        try:
+            value = method()
+        except Exception:
+            continue
+        if isinstance(value, (list, tuple)):
+            parts.extend(str(v) for v in value if v)
+        elif value:
+            parts.append(str(value))
+    return "\n".join(parts)
+
+
+def _is_retryable(err: Exception) -> bool:
+    """True if err looks like a transient LLM/network failure"""
+    # An inner asyncio/builtin TimeoutError often carries no message to match on
+    return isinstance(err, asyncio.TimeoutError) or bool(_RETRYABLE_ERROR_RE.search(str(err)))
+
+
+def _extract_retry_after(err: Exception) -> Optional[float]:
+    """Seconds the provider asked us to wait, from response headers or the error text"""
+    response = getattr(err, 'response', None)
+    headers = getattr(response, 'headers', None)
+    if headers:
+        for header in ('Retry-After', 'X-RateLimit-Reset'):
+            value = headers.get(header)
+            try:
+                if value is not None:
+                    return min(max(float(value), 0.0), _RETRY_AFTER_MAX_SECONDS)
+            except (TypeError, ValueError):
+                pass  # HTTP-date form; fall through to the message / backoff
+    match = _RETRY_HINT_RE.search(str(err))
+    if match:
+        return min(float(match.group(1)), _RETRY_AFTER_MAX_SECONDS)
+    return None
+
+
+def _retry_delay(attempt: int, err: Optional[Exception] = None) -> float:
+    """
+    The provider's Retry-After hint when err carries one, plus up to 1s of jitter.
+    Otherwise exponential backoff (1s, 2s, 4s, ...; 5s, 10s, 20s, ... for rate limits)
+    capped at 60s, with full jitter so concurrent retries don't land in lockstep.
+    """
+    jitter_enabled = config.LLM_RETRY_JITTER_ENABLED
+    retry_after = _extract_retry_after(err) if err is not None else None
+    if retry_after is not None:
+        return retry_after + (random.uniform(0, 1) if jitter_enabled else 0.0)
+    base = _RATE_LIMIT_RETRY_BASE_SECONDS if err is not None and _RATE_LIMIT_RE.search(str(err)) else _RETRY_BASE_SECONDS
+    delay = min(base * 2 ** attempt, _RETRY_DELAY_CAP_SECONDS)
+    return random.uniform(0, delay) if jitter_enabled else delay
+
+
+def _get_shared_loop() -> asyncio.AbstractEventLoop:
+    """The session manager's long-lived loop, used by apply()/apply_batch()"""
+    return BrowserUseSessionManager.get_instance().get_loop()
+
+
+class _PrefixAdapter(logging.LoggerAdapter):
+    """Prepends the filler's log_prefix to each message"""
+
+    def process(self, msg, kwargs):
+        return f"{self.extra['prefix']}{msg}", kwargs
+
+
+class _ApplicationWorkerPool:
+    """
+    Long-lived workers on the shared event loop, consuming fillers from an asyncio.Queue.
+    All workers create their agents through the BrowserUseSessionManager singleton, so
+    they share its LLM client and persistent browser profile instead of each job paying
+    for its own event loop and startup.
+    """
+
+    def __init__(self, size: int):
+        self.size = max(1, size)
+        self._queue: Optional[asyncio.Queue] = None
+        self._workers: List[asyncio.Task] = []
+
+    async def _worker(self, worker_id: int):
+        while True:
+            filler, fut = await self._queue.get()
+            try:
+                filler._context_id = worker_id  # each worker drives its own browser slot
+                status = await filler.apply_async()
+            except Exception as e:  # apply_async maps its own errors; this is a last resort
+                logger.error("Pool worker %s: unexpected error: %s", worker_id, e, exc_info=True)
+                status = config.JOB_STATUS_APP_FAILED_UNEXPECTED
+            finally:
+                self._queue.task_done()
+            if not fut.done():
+                fut.set_result(status)
+
+    async def submit(self, filler: 'BrowserUseFiller') -> str:
+        """Queue one application and wait for its status (runs on the shared loop)."""
+        if self._queue is None:
+            self._queue = asyncio.Queue()
+            self._workers = [asyncio.create_task(self._worker(i)) for i in range(self.size)]
+            logger.info("Started browser-use worker pool with %s worker(s)", self.size)
+        fut = asyncio.get_running_loop().create_future()
+        await self._queue.put((filler, fut))
+        return await fut
+
+    def submit_sync(self, filler: 'BrowserUseFiller') -> str:
+        return asyncio.run_coroutine_threadsafe(self.submit(filler), _get_shared_loop()).result()
+
+
+_pool: Optional[_ApplicationWorkerPool] = None
+_pool_lock = threading.Lock()
+
+
+def _get_pool() -> _ApplicationWorkerPool:
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = _ApplicationWorkerPool(config.BROWSER_POOL_SIZE)
+    return _pool
+
+
+# Steps taken by recent successful agent runs, per ATS platform, used to size max_steps.
+# Loaded lazily and written once at exit.
+AGENT_STEPS_FILE_PATH = Path.home() / ".cache" / "job_automator" / "agent_steps.json"
+_STEP_HISTORY_SIZE = 50
+_STEP_HISTORY_MIN_SAMPLES = 5
+_MIN_ADAPTIVE_STEPS = 15
+_step_history: Optional[Dict[str, List[int]]] = None
+_step_history_lock = threading.Lock()
+
+
+def _load_step_history() -> Dict[str, List[int]]:
+    """Caller holds _step_history_lock."""
+    global _step_history
+    if _step_history is None:
+        _step_history = {}
+        try:
+            with open(AGENT_STEPS_FILE_PATH, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if isinstance(data, dict):
+                _step_history = {k: [int(n) for n in v][-_STEP_HISTORY_SIZE:] for k, v in data.items() if isinstance(v, list)}
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError, TypeError) as e:
+            logger.warning("Could not load agent step history %s: %s", AGENT_STEPS_FILE_PATH, e)
+        atexit.register(_save_step_history)
+    return _step_history
+
+
+def _save_step_history():
+    with _step_history_lock:
+        if not _step_history:
+            return
+        try:
+            AGENT_STEPS_FILE_PATH.parent.mkdir(parents=True, exist_ok=True)
+            with open(AGENT_STEPS_FILE_PATH, 'w', encoding='utf-8') as f:
+                json.dump(_step_history, f)
+        except OSError as e:
+            logger.warning("Could not save agent step history %s: %s", AGENT_STEPS_FILE_PATH, e)
+
+
+def _record_steps(ats: str, steps: int):
+    with _step_history_lock:
+        history = _load_step_history().setdefault(ats, [])
+        history.append(steps)
+        del history[:-_STEP_HISTORY_SIZE]
+
+
+def _adaptive_max_steps(ats: str) -> int:
+    """config.AGENT_MAX_STEPS, lowered to ~1.3x the ATS's p95 once there are enough samples"""
+    ceiling = config.AGENT_MAX_STEPS
+    with _step_history_lock:
+        history = sorted(_load_step_history().get(ats, ()))
+    if len(history) < _STEP_HISTORY_MIN_SAMPLES:
+        return ceiling
+    p95 = history[min(len(history) - 1, int(len(history) * 0.95))]
+    return min(ceiling, max(_MIN_ADAPTIVE_STEPS, int(p95 * 1.3)))
+
+
+# (application host, job id) pairs already applied to successfully, so a duplicate
+# posting skips the whole agent run. Loaded on first use and written once at exit.
+APPLIED_FILE_PATH = Path.home() / ".cache" / "job_automator" / "applied.json"
+_applied_set: Optional[Set[Tuple[str, str]]] = None
+_applied_dirty = False
+_applied_lock = threading.Lock()
+
+
+def _load_applied_set() -> Set[Tuple[str, str]]:
+    """Caller holds _applied_lock."""
+    global _applied_set
+    if _applied_set is None:
+        _applied_set = set()
+        try:
+            with open(APPLIED_FILE_PATH, 'r', encoding='utf-8') as f:
+                _applied_set = {(host, job_id) for host, job_id in json.load(f)}
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError, TypeError) as e:
+            logger.warning("Could not load applied-jobs cache %s: %s", APPLIED_FILE_PATH, e)
+        atexit.register(_save_applied_set)
+    return _applied_set
+
+
+def _save_applied_set():
+    global _applied_dirty
+    with _applied_lock:
+        if not _applied_dirty:
+            return
+        try:
+            APPLIED_FILE_PATH.parent.mkdir(parents=True, exist_ok=True)
+            with open(APPLIED_FILE_PATH, 'w', encoding='utf-8') as f:
+                json.dump(sorted(_applied_set), f)
+            _applied_dirty = False
+        except OSError as e:
+            logger.warning("Could not save applied-jobs cache %s: %s", APPLIED_FILE_PATH, e)
+
+
+def _already_applied(key: Tuple[str, str]) -> bool:
+    with _applied_lock:
+        return key in _load_applied_set()
+
+
+def _mark_applied(key: Tuple[str, str]):
+    global _applied_dirty
+    with _applied_lock:
+        _load_applied_set().add(key)
+        _applied_dirty = True
+
+
+# Static pieces of the agent task, shared by every job as-is
+_TASK_INSTRUCTIONS = """
+Instructions:
+1. Navigate to the application URL
+2. Click the apply button to start
+3. Fill out the entire application form with the information above
+4. Upload the resume when asked
+5. For demographic questions (gender, race, veteran status, disability), select "Prefer not to answer" if available
+6. Submit the application when complete
+"""
+_TASK_CLOSING = "\nComplete the application and confirm it was submitted successfully.\n"
+# Job-specific block of the task; optional lines are passed in pre-rendered (or empty)
+_JOB_BLOCK_TEMPLATE = (
+    "\nApply to the {job_title} position at {company_name}.\n\n"
+    "Application URL: {application_url}\n"
+    "{resume_line}{summary_line}" + _TASK_CLOSING
+)
+
+
+# Candidate-info block of the task, parsed once at import. The candidate's details go in
+# as one compact JSON object (empty fields omitted), which is fewer tokens than a labelled
+# prose list and unambiguous for the agent to map onto form fields.
+_TASK_PROLOGUE_TMPL = string.Template("""
+Your Information (JSON; use these exact values in the form):
+$candidate_json
+""" + _TASK_INSTRUCTIONS)
+
+
+@functools.lru_cache(maxsize=8)
+def _build_task_prologue(prompt_fields: tuple) -> str:
+    """Render the job-independent part of the agent task (cached per distinct candidate info)"""
+    user_info = dict(prompt_fields)
+    location = ' '.join(filter(None, [', '.join(filter(None, [user_info['city'], user_info['state']])),
+                                      user_info['zip_code']]))
+    candidate = {
+        'first_name': user_info['first_name'],
+        'last_name': user_info['last_name'],
+        'email': user_info['email'],
+        'phone': user_info['phone'],
+        'location': location,
+        'linkedin': user_info['linkedin'],
+        'github': user_info.get('github', ''),
+        'work_authorized': user_info['work_authorized'],
+        'require_sponsorship': user_info['require_sponsorship'],
+        'years_experience': config.YEARS_EXPERIENCE,
+        'current_title': config.JOB_TITLE_CURRENT,
+    }
+    candidate_json = json.dumps({k: v for k, v in candidate.items() if v not in (None, '')},
+                                ensure_ascii=False, separators=(',', ':'))
+    return _TASK_PROLOGUE_TMPL.substitute(candidate_json=candidate_json)
+
 
 class BrowserUseFiller:
     """
@@ -31,20 +414,35 @@ class BrowserUseFiller:
     Uses GPT-4 Vision to understand and interact with any job application form.
     """
 
+    _use_shared_loop = True
+
     def __init__(self, job_data, user_profile, document_paths, credentials=None):
         self.job_data = job_data
         self.user_profile = user_profile
         self.document_paths = document_paths
         self.credentials = credentials
-        self.logger = logging.getLogger(__name__)
-
         job_id = job_data.get('job_id', job_data.get('primary_identifier', 'unknown'))
         self.log_prefix = f"[BrowserUseFiller - JobID: {job_id}] "
+        # Prefixes every message with log_prefix, only for records that are actually emitted
+        self.logger = _PrefixAdapter(logger, {'prefix': self.log_prefix})
+
+        # Set by _on_step_end when a step already shows the confirmation page / a hard blocker
+        self._early_success = False
+        self._blocked = False
+        # Steps taken by the current agent.run(), counted by _on_step_end
+        self._step_count = 0
+        # Browser slot used by apply_many when running concurrently (0 = main profile)
+        self._context_id = 0
 
         if not BROWSER_USE_AVAILABLE:
-            self.logger.error(f"{self.log_prefix}browser-use library not installed!")
+            self.logger.error("browser-use library not installed!")
             raise ImportError("browser-use library is required. Install: pip install browser-use")
 
+        # Short job description for the task prompt, truncated once here rather than per build.
+        # Prefer the excerpt stored at ingestion (database.store_job_data) over the full text.
+        self._job_desc_short = (job_data.get('job_description_excerpt') or job_data.get('job_description')
+                                or job_data.get('description') or '')[:400]
+
     async def apply_async(self) -> str:
         """
         Apply to job using AI agent (async).
@@ -52,198 +450,387 @@ class BrowserUseFiller:
         Returns status string from config.
         """
         try:
-            self.logger.info(f"{self.log_prefix}Starting Browser-Use AI agent application...")
-
-            # Get job application URL FIRST (fail fast if missing)
-            app_url = self.job_data.get('application_url')
-            if not app_url:
-                self.logger.error(f"{self.log_prefix}No application URL found")
-                return config.JOB_STATUS_APP_FAILED_ATS
-
-            self.logger.info(f"{self.log_prefix}Application URL: {app_url}")
+            self.logger.info("Starting Browser-Use AI agent application...")
 
-            # Check API key
-            if not config.GEMINI_API_KEY:
-                self.logger.error(f"{self.log_prefix}GEMINI_API_KEY not configured!")
-                return config.JOB_STATUS_APP_FAILED_UNEXPECTED
+            precheck = self._precheck_status()
+            if precheck is not None:
+                return precheck
+            app_url = self.job_data['application_url']
+            applied_key = self._applied_key()
 
             # Get or create singleton session manager
-            self.logger.info(f"{self.log_prefix}Getting browser session manager...")
+            self.logger.info("Getting browser session manager...")
             session_manager = BrowserUseSessionManager.get_instance()
 
             # Initialize browser session if not already done (only happens once!)
             if not session_manager._initialized:
-                self.logger.info(f"{self.log_prefix}First application - initializing session manager...")
+                self.logger.info("First application - initializing session manager...")
                 if not session_manager.initialize():
-                    self.logger.error(f"{self.log_prefix}Failed to initialize session manager")
+                    self.logger.error("Failed to initialize session manager")
                     return config.JOB_STATUS_APP_FAILED_UNEXPECTED
-                self.logger.info(f"{self.log_prefix}✅ Session manager initialized (browser will be reused for all jobs)")
+                self.logger.info("✅ Session manager initialized (browser will be reused for all jobs)")
             else:
-                self.logger.info(f"{self.log_prefix}✓ Reusing existing session (job #{session_manager._session_count + 1})")
-
-            # Prepare user information for the agent
-            self.logger.info(f"{self.log_prefix}Preparing user information...")
-            user_info = self._prepare_user_info()
+                self.logger.info("✓ Reusing existing session (job #%s)", session_manager._session_count + 1)
 
             # Create detailed task for the AI agent
-            self.logger.info(f"{self.log_prefix}Creating agent task...")
-            task = self._create_agent_task(user_info)
-
-            # Prepare file paths for upload
-            import os
-            available_files = []
-            resume_path = self.document_paths.get('resume')
-            cover_letter_path = self.document_paths.get('cover_letter')
-
-            if resume_path and os.path.exists(resume_path):
-                available_files.append(resume_path)
-                self.logger.info(f"{self.log_prefix}✓ Resume available for upload: {resume_path}")
-            else:
-                self.logger.warning(f"{self.log_prefix}⚠ Resume not found: {resume_path}")
-
-            if cover_letter_path and os.path.exists(cover_letter_path):
-                available_files.append(cover_letter_path)
-                self.logger.info(f"{self.log_prefix}✓ Cover letter available for upload: {cover_letter_path}")
-            else:
-                self.logger.warning(f"{self.log_prefix}⚠ Cover letter not found: {cover_letter_path}")
+            self.logger.info("Creating agent task...")
+            # Candidate info + instructions go in the system message (identical for every job);
+            # the task itself is only the per-job block
+            task = self._job_context_block()
+
+            # File paths for upload (checked on first use, cached on the filler)
+            available_files = self._available_files
+            for doc_name, doc_key in _UPLOAD_DOCUMENTS:
+                doc_path = self.document_paths.get(doc_key)
+                doc_stat = self._file_stats.get(doc_path)
+                if doc_stat is not None:
+                    self.logger.info("✓ %s available for upload: %s (%d bytes)", doc_name, doc_path, doc_stat.st_size)
+                else:
+                    self.logger.warning("⚠ %s not found: %s", doc_name, doc_path)
 
             # Create agent using the session manager
             # Browser reuse happens automatically via the shared BrowserProfile!
-            self.logger.info(f"{self.log_prefix}Creating agent with {len(available_files)} files...")
-            agent = session_manager.create_agent(task, available_files)
+            self.logger.info("Creating agent with %s files...", len(available_files))
+            agent = session_manager.create_agent(task, available_files, context_id=self._context_id,
+                                                 system_extension=self._static_task_prologue)
 
             if not agent:
-                self.logger.error(f"{self.log_prefix}Failed to create agent")
+                self.logger.error("Failed to create agent")
                 return config.JOB_STATUS_APP_FAILED_UNEXPECTED
 
-            self.logger.info(f"{self.log_prefix}✓ Agent created (using persistent browser session)")
-            self.logger.info(f"{self.log_prefix}🤖 AI agent starting - navigating to {app_url}")
-            self.logger.info(f"{self.log_prefix}📋 Task: Fill application form")
-            self.logger.info(f"{self.log_prefix}⏳ Maximum: 50 steps")
+            ats = identify_ats_platform(app_url) or 'unknown'
+            max_steps = _adaptive_max_steps(ats)
+
+            self.logger.info("✓ Agent created (using persistent browser session)")
+            self.logger.info("🤖 AI agent starting - navigating to %s", app_url)
+            self.logger.info("📋 Task: Fill application form")
+            self.logger.info("⏳ Maximum: %s steps / %ss", max_steps, config.AGENT_WALL_TIMEOUT_S)
 
             # Run the agent WITH retry logic for timeouts
-            self.logger.info(f"{self.log_prefix}Running agent.run(max_steps=50)...")
+            self.logger.info("Running agent.run(max_steps=%s)...", max_steps)
 
-            max_retries = 2
+            max_retries = max(1, config.LLM_MAX_RETRIES)
             result = None
+            loop = asyncio.get_running_loop()
             for attempt in range(max_retries):
+                deadline = loop.time() + config.AGENT_WALL_TIMEOUT_S
                 try:
-                    result = await agent.run(max_steps=50)
-                    self.logger.info(f"{self.log_prefix}✓ Agent.run() completed successfully")
+                    self._early_success = False
+                    self._blocked = False
+                    self._step_count = 0
+                    result = await asyncio.wait_for(
+                        agent.run(max_steps=max_steps, on_step_end=self._on_step_end),
+                        timeout=config.AGENT_WALL_TIMEOUT_S,
+                    )
+                    self.logger.info("✓ Agent.run() completed successfully")
                     break  # Success, exit retry loop
 
                 except Exception as run_err:
-                    error_msg = str(run_err).lower()
-                    is_timeout = any(keyword in error_msg for keyword in ['timeout', 'timed out', '60 seconds'])
-
-                    if is_timeout and attempt < max_retries - 1:
-                        wait_time = 30 * (attempt + 1)  # 30s, 60s
-                        self.logger.warning(f"{self.log_prefix}⚠ LLM timeout on attempt {attempt + 1}/{max_retries}. Retrying in {wait_time}s...")
+                    # asyncio.TimeoutError is the builtin TimeoutError on 3.11+, so a timeout raised
+                    # inside agent.run (LLM / CDP) looks the same as wait_for's; only the deadline tells
+                    if isinstance(run_err, asyncio.TimeoutError) and loop.time() >= deadline:
+                        # Wall-clock cap hit: the agent is stuck, retrying would just burn another run
+                        self.logger.error("Agent.run() exceeded %ss wall-clock timeout after %s steps", config.AGENT_WALL_TIMEOUT_S, self._step_count)
+                        return config.JOB_STATUS_APP_FAILED_UNEXPECTED
+
+                    if _is_retryable(run_err) and attempt < max_retries - 1:
+                        wait_time = _retry_delay(attempt, run_err)
+                        self.logger.warning("⚠ Transient LLM error on attempt %s/%s: %s. Retrying in %.1fs...", attempt + 1, max_retries, run_err, wait_time)
                         await asyncio.sleep(wait_time)
                         continue  # Retry
 
-                    # Final attempt failed or non-timeout error
-                    self.logger.error(f"{self.log_prefix}Agent.run() failed: {run_err}", exc_info=True)
+                    # Final attempt failed or non-retryable error
+                    self.logger.error("Agent.run() failed: %s", run_err, exc_info=True)
                     return config.JOB_STATUS_APP_FAILED_UNEXPECTED
             else:
                 # All retries exhausted
-                self.logger.error(f"{self.log_prefix}All {max_retries} retry attempts exhausted")
+                self.logger.error("All %s retry attempts exhausted", max_retries)
                 return config.JOB_STATUS_APP_FAILED_UNEXPECTED
 
-            self.logger.info(f"{self.log_prefix}✅ Agent completed. Result: {result}")
+            self.logger.info("✅ Agent completed. Result: %s", result)
+
+            if self._blocked:
+                self.logger.warning("Application blocked (captcha/verification), agent stopped early")
+                return config.JOB_STATUS_APP_FAILED_ATS
 
             # Analyze result to determine success
-            if self._is_application_successful(result):
-                self.logger.info(f"{self.log_prefix}Application successful!")
+            if self._early_success or self._is_application_successful(result):
+                self.logger.info("Application successful!")
+                _record_steps(ats, self._step_count)
+                if applied_key:
+                    _mark_applied(applied_key)
                 return config.JOB_STATUS_APPLIED_SUCCESS
             else:
-                self.logger.warning(f"{self.log_prefix}Application may have failed")
+                self.logger.warning("Application may have failed")
                 return config.JOB_STATUS_APP_FAILED_ATS
 
         except Exception as e:
-            self.logger.error(f"{self.log_prefix}Browser-Use agent error: {e}", exc_info=True)
+            self.logger.error("Browser-Use agent error: %s", e, exc_info=True)
             return config.JOB_STATUS_APP_FAILED_UNEXPECTED
 
     def apply(self) -> str:
         """
         Synchronous wrapper for apply_async.
-        Returns status string from config.
+        Returns status string from config. apply_async maps application errors to a
+        status itself; anything raised here (event loop / worker pool failures) is
+        operational and propagates to the caller with its traceback.
+        """
+        if config.USE_BROWSER_POOL:
+            return _get_pool().submit_sync(self)
+        # Run async function in sync context
+        return self._run_sync(self.apply_async())
+
+    @classmethod
+    def use_shared_loop(cls, enabled: bool = True) -> None:
+        """
+        Run apply()/apply_batch() on the session manager's long-lived event loop (default)
+        so async resources opened by browser-use (HTTP sessions, the browser connection)
+        survive between jobs. use_shared_loop(False) goes back to a new asyncio.run()
+        loop per call.
         """
+        cls._use_shared_loop = enabled
+
+    @classmethod
+    def _run_sync(cls, coro):
+        if cls._use_shared_loop:
+            return asyncio.run_coroutine_threadsafe(coro, _get_shared_loop()).result()
+        # asyncio.run() creates a new event loop each time
+        return asyncio.run(coro)
+
+    @classmethod
+    async def apply_many(cls, fillers: List['BrowserUseFiller'], concurrency: Optional[int] = None) -> List[str]:
+        """
+        Run several applications concurrently on one event loop, at most `concurrency`
+        (default config.MAX_CONCURRENT_APPLICATIONS) at a time. Each running application
+        holds a browser slot (context id) so concurrent agents never share a browser.
+        Returns one status string per filler, in order.
+        """
+        concurrency = max(1, concurrency or config.MAX_CONCURRENT_APPLICATIONS)
+        # Free browser slots; taking one from the queue doubles as the concurrency limit
+        slots: asyncio.Queue = asyncio.Queue()
+        for context_id in range(concurrency):
+            slots.put_nowait(context_id)
+
+        async def _one(filler: 'BrowserUseFiller') -> str:
+            context_id = await slots.get()
+            try:
+                filler._context_id = context_id
+                return await filler.apply_async()
+            finally:
+                slots.put_nowait(context_id)
+
+        results = await asyncio.gather(*[_one(f) for f in fillers], return_exceptions=True)
+        # apply_async already maps its own errors to a status; this only catches cancellation and the like
+        return [r if isinstance(r, str) else config.JOB_STATUS_APP_FAILED_UNEXPECTED for r in results]
+
+    @classmethod
+    def apply_batch(cls, fillers: List['BrowserUseFiller']) -> List[str]:
+        """Synchronous wrapper for apply_many."""
         try:
-            # Run async function in sync context
-            # Always use asyncio.run() - it creates a new event loop if needed
-            return asyncio.run(self.apply_async())
+            return cls._run_sync(cls.apply_many(fillers))
         except Exception as e:
-            self.logger.error(f"{self.log_prefix}Error in sync apply: {e}", exc_info=True)
-            return config.JOB_STATUS_APP_FAILED_UNEXPECTED
+            logger.error("Error in sync apply_batch: %s", e, exc_info=True)
+            return [config.JOB_STATUS_APP_FAILED_UNEXPECTED] * len(fillers)
 
-    def _prepare_user_info(self) -> Dict:
-        """Prepare user information for the agent"""
-        return {
-            'name': self.user_profile.get('name', config.YOUR_NAME),
-            'first_name': self.user_profile.get('first_name', config.FIRST_NAME),
-            'last_name': self.user_profile.get('last_name', config.LAST_NAME),
-            'email': self.user_profile.get('email', config.YOUR_EMAIL),
-            'phone': self.user_profile.get('phone', config.YOUR_PHONE),
-            'linkedin': self.user_profile.get('linkedin_url', config.YOUR_LINKEDIN_URL),
-            'github': self.user_profile.get('github_url', config.YOUR_GITHUB_URL),
-            'website': self.user_profile.get('website', config.WEBSITE),
-            'location': self.user_profile.get('location', config.LOCATION),
-            'address': config.FULL_ADDRESS,
-            'street': config.STREET_ADDRESS,
-            'city': config.CITY,
-            'state': config.STATE,
-            'zip_code': config.ZIP_CODE,
-            'work_authorized': config.WORK_AUTHORIZED,
-            'require_sponsorship': config.REQUIRE_SPONSORSHIP,
-            'gender': config.GENDER,
-            'race': config.RACE_ETHNICITY,
-            'veteran_status': config.VETERAN_STATUS,
-            'disability_status': config.DISABILITY_STATUS,
-            'resume_path': self.document_paths.get('resume'),
-            'cover_letter_path': self.document_paths.get('cover_letter'),
-        }
-
-    def _create_agent_task(self, user_info: Dict) -> str:
-        """Create simple, high-level task for AI agent - let the AI figure out HOW to do it"""
-
-        # Get file paths
-        resume_path = user_info.get('resume_path', '')
-        cover_letter_path = user_info.get('cover_letter_path', '')
-
-        # Get job context
-        job_title = self.job_data.get('job_title', 'this position')
-        company_name = self.job_data.get('company_name', 'this company')
-
-        task = f"""
-Apply to the {job_title} position at {company_name}.
-
-Application URL: {self.job_data.get('application_url')}
-
-Your Information:
-- Name: {user_info['first_name']} {user_info['last_name']}
-- Email: {user_info['email']}
-- Phone: {user_info['phone']}
-- Location: {user_info['city']}, {user_info['state']} {user_info['zip_code']}
-- LinkedIn: {user_info['linkedin']}
-- GitHub: {user_info.get('github', '')}
-- Resume: {resume_path}
-- Work Authorization: {user_info['work_authorized']}
-- Require Sponsorship: {user_info['require_sponsorship']}
-- Years of Experience: {config.YEARS_EXPERIENCE}
-- Current Title: {config.JOB_TITLE_CURRENT}
+    def _precheck_status(self) -> Optional[str]:
+        """
+        Status to return without running an agent (missing URL, already applied, no API key),
+        or None if the job should go to the agent
+        """
+        # Get job application URL FIRST (fail fast if missing)
+        app_url = self.job_data.get('application_url')
+        if not app_url:
+            self.logger.error("No application URL found")
+            return config.JOB_STATUS_APP_FAILED_ATS
+
+        self.logger.info("Application URL: %s", app_url)
+
+        # Duplicate posting of a job we already applied to: skip the agent entirely
+        applied_key = self._applied_key()
+        if applied_key and _already_applied(applied_key):
+            self.logger.info("Already applied to %s (job %s), skipping agent run", *applied_key)
+            return config.JOB_STATUS_APPLIED_SUCCESS
+
+        # Check API key
+        if not config.GEMINI_API_KEY:
+            self.logger.error("GEMINI_API_KEY not configured!")
+            return config.JOB_STATUS_APP_FAILED_UNEXPECTED
+        return None
 
-Instructions:
-1. Navigate to the application URL
-2. Click the apply button to start
-3. Fill out the entire application form with the information above
-4. Upload the resume when asked
-5. For demographic questions (gender, race, veteran status, disability), select "Prefer not to answer" if available
-6. Submit the application when complete
+    @classmethod
+    async def apply_combined_async(cls, fillers: List['BrowserUseFiller']) -> List[str]:
+        """
+        Apply to several jobs with ONE agent run: the candidate info and instructions are
+        sent once, followed by a section per job, and the agent reports each outcome with
+        a JOB_<n>_DONE / JOB_<n>_FAILED marker. Saves the per-job agent start-up and
+        repeated prompt prefix, at the cost of one failure mode affecting the whole batch.
+        Jobs settled by the usual prechecks never reach the agent, and batches whose candidate
+        profiles differ fall back to apply_many since they cannot share one system message.
+        Returns one status string per filler, in order.
+        """
+        statuses: List[Optional[str]] = [f._precheck_status() for f in fillers]
+        pending = [i for i, status in enumerate(statuses) if status is None]
+        if len(pending) <= 1:
+            for i in pending:
+                statuses[i] = await fillers[i].apply_async()
+            return statuses
+
+        batch = [fillers[i] for i in pending]
+        if len({f._static_task_prologue for f in batch}) > 1:
+            logger.info("Combined run: candidate profiles differ, applying to %s jobs separately", len(batch))
+            for i, status in zip(pending, await cls.apply_many(batch)):
+                statuses[i] = status
+            return statuses
+
+        for i, status in zip(pending, await cls._run_combined(batch)):
+            statuses[i] = status
+        return statuses
+
+    @classmethod
+    async def _run_combined(cls, fillers: List['BrowserUseFiller']) -> List[str]:
+        """One agent run over fillers that passed their prechecks and share a task prologue"""
+        failed = [config.JOB_STATUS_APP_FAILED_UNEXPECTED] * len(fillers)
+        try:
+            session_manager = BrowserUseSessionManager.get_instance()
+            if not session_manager._initialized and not session_manager.initialize():
+                logger.error("Combined run: failed to initialize session manager")
+                return failed
+
+            sections = []
+            available_files: List[str] = []
+            for n, filler in enumerate(fillers, 1):
+                sections.append(f"\n--- JOB {n} ---")
+                sections.append(filler._job_context_block())
+                sections.append(f"When job {n} is submitted, output JOB_{n}_DONE. If it cannot be "
+                                f"completed, output JOB_{n}_FAILED and continue with the next job.\n")
+                available_files.extend(p for p in filler._available_files if p not in available_files)
+            task = "".join(sections)
+
+            agent = session_manager.create_agent(task, available_files,
+                                                 system_extension=fillers[0]._static_task_prologue)
+            if not agent:
+                logger.error("Combined run: failed to create agent")
+                return failed
+
+            logger.info("Combined run: applying to %s jobs with one agent", len(fillers))
+            result = await asyncio.wait_for(
+                agent.run(max_steps=config.AGENT_MAX_STEPS * len(fillers)),
+                timeout=config.AGENT_WALL_TIMEOUT_S * len(fillers),
+            )
+        except Exception as e:
+            logger.error("Combined run failed: %s", e, exc_info=True)
+            return failed
+
+        # Scan only what the agent wrote: str(result) also echoes the task, which names every marker
+        output = _agent_output_text(result)
+        statuses = []
+        for n, filler in enumerate(fillers, 1):
+            if re.search(rf'\bJOB_{n}_DONE\b', output):
+                statuses.append(config.JOB_STATUS_APPLIED_SUCCESS)
+                applied_key = filler._applied_key()
+                if applied_key:
+                    _mark_applied(applied_key)
+            else:
+                statuses.append(config.JOB_STATUS_APP_FAILED_ATS)
+        return statuses
 
-Complete the application and confirm it was submitted successfully.
-"""
-        return task
+    @classmethod
+    def apply_combined(cls, fillers: List['BrowserUseFiller']) -> List[str]:
+        """Synchronous wrapper for apply_combined_async."""
+        try:
+            return cls._run_sync(cls.apply_combined_async(fillers))
+        except Exception as e:
+            logger.error("Error in sync apply_combined: %s", e, exc_info=True)
+            return [config.JOB_STATUS_APP_FAILED_UNEXPECTED] * len(fillers)
+
+    def _applied_key(self) -> Optional[Tuple[str, str]]:
+        """(application host, job id) used by the already-applied short-circuit"""
+        app_url = self.job_data.get('application_url')
+        job_id = self.job_data.get('job_id', self.job_data.get('primary_identifier'))
+        if not app_url or not job_id:
+            return None
+        return (urlparse(app_url).netloc.lower(), str(job_id))
+
+    @functools.cached_property
+    def _file_stats(self) -> Dict[str, Optional[os.stat_result]]:
+        """
+        stat result (None if missing) per upload document, checked once per filler and only
+        once apply_async has passed its URL / API key / session checks
+        """
+        session_manager = BrowserUseSessionManager.get_instance()
+        doc_paths = (self.document_paths.get(doc_key) for _, doc_key in _UPLOAD_DOCUMENTS)
+        return {p: session_manager.file_stat(p) for p in doc_paths if p}
+
+    @functools.cached_property
+    def _available_files(self) -> List[str]:
+        """Upload documents that exist on disk"""
+        return [p for p, st in self._file_stats.items() if st is not None]
+
+    def _prompt_fields(self) -> tuple:
+        """The candidate fields the task prologue renders, read straight from the profile/config"""
+        profile = self.user_profile
+        return (
+            ('first_name', profile.get('first_name', config.FIRST_NAME)),
+            ('last_name', profile.get('last_name', config.LAST_NAME)),
+            ('email', profile.get('email', config.YOUR_EMAIL)),
+            ('phone', profile.get('phone', config.YOUR_PHONE)),
+            ('linkedin', profile.get('linkedin_url', config.YOUR_LINKEDIN_URL)),
+            ('github', profile.get('github_url', config.YOUR_GITHUB_URL)),
+            ('city', config.CITY),
+            ('state', config.STATE),
+            ('zip_code', config.ZIP_CODE),
+            ('work_authorized', config.WORK_AUTHORIZED),
+            ('require_sponsorship', config.REQUIRE_SPONSORSHIP),
+        )
+
+    @functools.cached_property
+    def _static_task_prologue(self) -> str:
+        """Candidate info + instructions part of the agent task; identical for every job"""
+        # Document paths differ per job (tailored resumes), so they stay out of the prologue
+        # and its cache key; _job_context_block carries them instead
+        prompt_fields = self._prompt_fields()
+        try:
+            return _build_task_prologue(prompt_fields)
+        except TypeError:  # unhashable profile value (e.g. a list); render without the cache
+            return _build_task_prologue.__wrapped__(prompt_fields)
+
+    def _job_context_block(self) -> str:
+        """Job-specific part of the agent task"""
+        resume_path = self.document_paths.get('resume')
+        return _JOB_BLOCK_TEMPLATE.format_map({
+            'job_title': self.job_data.get('job_title', 'this position'),
+            'company_name': self.job_data.get('company_name', 'this company'),
+            'application_url': self.job_data.get('application_url'),
+            'resume_line': f"Resume: {resume_path}\n" if resume_path else '',
+            # Gives the agent context for free-text questions like "Why this role?"
+            'summary_line': f"\nRole summary: {self._job_desc_short}\n" if self._job_desc_short else '',
+        })
+
+    async def _on_step_end(self, agent) -> None:
+        """
+        browser-use step hook: counts steps, and stops the agent as soon as a step reports the
+        submission confirmation (or a captcha/verification wall) instead of letting it spend
+        more steps (LLM calls) on a run whose outcome is already decided.
+        """
+        self._step_count += 1
+        try:
+            last_results = getattr(agent.state, 'last_result', None) or []
+            step_text = ' '.join(str(getattr(r, 'extracted_content', None) or '') for r in last_results)
+            if not step_text.strip():
+                return
+            normalized = _normalize_result_text(step_text)
+            # Strict wording only, and no failure keyword alongside it (_is_application_successful)
+            if _SUBMISSION_CONFIRMED_RE.search(normalized) and self._is_application_successful(step_text):
+                self.logger.info("✓ Confirmation detected mid-run, stopping agent early")
+                self._early_success = True
+                agent.stop()
+            elif _TERMINAL_FAILURE_RE.search(normalized):
+                self.logger.info("Blocker detected mid-run, stopping agent early")
+                self._blocked = True
+                agent.stop()
+        except Exception as e:
+            # Never let the progress hook break the run itself
+            self.logger.debug("Step hook error (ignored): %s", e)
 
     def _is_application_successful(self, result) -> bool:
         """
@@ -253,41 +840,16 @@ Complete the application and confirm it was submitted successfully.
         if not result:
             return False
 
-        result_str = str(result).lower()
-
-        # Success indicators
-        success_keywords = [
-            'application submitted',
-            'successfully submitted',
-            'thank you for applying',
-            'application received',
-            'application complete',
-            'confirmation',
-            'we have received your application'
-        ]
-
-        # Failure indicators
-        failure_keywords = [
-            'error',
-            'failed',
-            'could not submit',
-            'unable to',
-            'captcha',
-            'verification required'
-        ]
-
-        # Check for failure first
-        for keyword in failure_keywords:
-            if keyword in result_str:
-                return False
+        result_str = _normalize_result_text(_result_text(result))
 
-        # Check for success
-        for keyword in success_keywords:
-            if keyword in result_str:
-                return True
-
-        # If unclear, assume failure (conservative)
-        return False
+        # Any failure keyword wins; if unclear, assume failure (conservative). Explicit submission
+        # wording ("application has been submitted") counts as success too
+        found_success = bool(_SUBMISSION_CONFIRMED_RE.search(result_str))
+        for match in _RESULT_RE.finditer(result_str):
+            if match.lastgroup == 'fail':
+                return False
+            found_success = True
+        return found_success
 
 
 # Export for use in automator
@@ -1,12 +1,12 @@
 # job_automator/ats_fillers/greenhouse_filler.py
 
-import logging
 import time
 import json # Make sure json is imported
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple, Any # Added Any
 from selenium.webdriver.common.by import By
 from selenium.webdriver.remote.webelement import WebElement
+from selenium.webdriver.support.ui import WebDriverWait
 from .base_filler import BaseFiller, ApplicationError # Ensure BaseFiller is correctly imported
 import config # Assuming config is in the accessible path
 from selenium.common.exceptions import (
@@ -14,12 +14,9 @@ from selenium.common.exceptions import (
     StaleElementReferenceException, ElementClickInterceptedException,
     WebDriverException, NoSuchFrameException
 )
-# Add these MongoDB imports (if using MongoDB)
 from datetime import datetime, date
-# import json # Already imported above
-from bson import ObjectId
-# from typing import Any # Already imported above
 
+# Optional: MongoDB job ids
 try:
     from bson import ObjectId
     HAS_MONGO = True
@@ -27,11 +24,217 @@ except ImportError:
     HAS_MONGO = False
     ObjectId = type('ObjectId', (), {})
 
+# Optional: serialize prompt data in one C pass (datetimes natively, ObjectId via default)
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+# XPath lowercase idiom: translate(x, _XPATH_UPPER, _XPATH_LOWER)
+_XPATH_UPPER = 'ABCDEFGHIJKLMNOPQRSTUVWXYZ'
+_XPATH_LOWER = 'abcdefghijklmnopqrstuvwxyz'
+
+# Phrases marking the "decline / prefer not to say" option of an EEO question (lowercase)
+_EEO_DECLINE_PHRASES = (
+    "decline to self-identify", "prefer not to say", "i don't wish to answer",
+    "choose not to disclose", "do not wish to provide", "decline to answer",
+)
+
+# Containers that usually hold EEO questions, most specific first
+_EEO_SECTION_XPATHS = (
+    "//div[contains(@class, 'eeo')]", # Common class for EEO sections
+    f"//fieldset[.//legend[contains(translate(., '{_XPATH_UPPER}', '{_XPATH_LOWER}'), 'equal opportunity')]]", # Fieldset with EEO legend
+    "//div[h3|h4|h5|legend[" + " or ".join(
+        f"contains(translate(., '{_XPATH_UPPER}', '{_XPATH_LOWER}'),'{topic}')"
+        for topic in ('gender', 'race', 'ethnicity', 'veteran', 'disability')
+    ) + "]]",
+)
+
+# Label/locator words of text fields backed by an autocomplete widget, which only offers
+# suggestions on real key events (lowercase)
+_AUTOCOMPLETE_FIELD_HINTS = ("location", "city", "school", "university", "college")
+
+
+def _xpath_literal(text: str) -> str:
+    """Quote text as an XPath 1.0 string literal (double quotes when it contains an apostrophe)"""
+    return f'"{text}"' if "'" in text else f"'{text}'"
+
+
+def _any_phrase_condition(text_expr: str) -> str:
+    """XPath predicate: lowercased text_expr contains any of the EEO decline phrases"""
+    lowered = f"normalize-space(translate({text_expr}, '{_XPATH_UPPER}', '{_XPATH_LOWER}'))"
+    return " or ".join(f"contains({lowered}, {_xpath_literal(phrase)})" for phrase in _EEO_DECLINE_PHRASES)
+
+
+# Every decline option (labels by full text, buttons/links by own text) inside any EEO
+# section, as ONE page-level expression: a single find_elements round-trip, and XPath's
+# node-set semantics return each option once even when matched sections are nested
+_EEO_SECTION_UNION = " | ".join(_EEO_SECTION_XPATHS)
+_EEO_DECLINE_OPTIONS_XPATH = (
+    f"({_EEO_SECTION_UNION})//*["
+    f"(self::label and ({_any_phrase_condition('.')}))"
+    f" or ((self::button or self::a) and ({_any_phrase_condition('text()')}))"
+    "]"
+)
+
+# Decline option (select option / label / span) below a field's element, for _select_prefer_not_option
+_PREFER_NOT_OPTION_XPATH = f".//*[(self::option or self::label or self::span) and ({_any_phrase_condition('.')})]"
+
+# File input strategies for _upload_resume / _upload_cover_letter, tried in order after the defaults.
+# Attribute matches only (Greenhouse renders name/id in lowercase, e.g. name="resume"); inputs
+# found only by their label/button text go through _file_input_by_text, which needs no translate()
+_RESUME_INPUT_LOCATORS = tuple((By.XPATH, xpath) for xpath in (
+    "//input[@type='file' and (contains(@name, 'resume') or contains(@id, 'resume') or contains(@aria-label, 'resume') or contains(@placeholder, 'resume'))]",
+    "//div[contains(@class, 'resume-upload-trigger')]//input[@type='file']" # Custom component
+))
+
+_COVER_LETTER_INPUT_LOCATORS = tuple((By.XPATH, xpath) for xpath in (
+    "//input[@type='file' and (contains(@name, 'cover') or contains(@id, 'cover') or contains(@aria-label, 'cover') or contains(@placeholder, 'cover'))]",
+))
+
+# Generic "additional document" inputs, used for the cover letter when no dedicated field exists
+_GENERIC_DOCUMENT_INPUT_LOCATORS = tuple((By.XPATH, xpath) for xpath in (
+    "//input[@type='file' and (contains(@name, 'document') or contains(@id, 'additionalFile') or contains(@aria-label, 'additional document'))]",
+))
+
+# Runs in the page: one round-trip returns every fillable control under the root element
+# (arguments[0], default #application_form) as a compact list, in place of the form's outerHTML
+_FORM_SCAN_JS = """
+const root = arguments[0] || document.getElementById('application_form');
+if (!root) { return null; }
+const clip = (s) => (s || '').replace(/\\s+/g, ' ').trim().slice(0, 200);
+return Array.from(root.querySelectorAll('input, select, textarea'))
+  .filter((e) => e.type !== 'hidden' && e.type !== 'submit')
+  .map((e) => {
+    const f = {tag: e.tagName.toLowerCase(), type: e.type || null, id: e.id || null, name: e.name || null,
+               label: clip((e.labels && e.labels[0] && e.labels[0].innerText) || e.getAttribute('aria-label') || e.placeholder),
+               required: e.required || e.getAttribute('aria-required') === 'true'};
+    if (e.type === 'radio' || e.type === 'checkbox') {
+      f.value = e.value;
+      const group = e.closest('fieldset, .field');
+      const legend = group && group.querySelector('legend, label');
+      if (legend) { f.group = clip(legend.innerText); }
+    }
+    else if (e.tagName === 'SELECT') { f.options = Array.from(e.options).slice(0, 30).map((o) => clip(o.text)); }
+    else if (e.type === 'file') {
+      const group = e.closest('fieldset, .field'); // Label / "Upload resume" button text around the input
+      if (group) { f.group = clip(group.innerText); }
+    }
+    else { f.value = e.value || null; }
+    return f;
+  });
+"""
+
+# Resolves [by, value] locators to their first matching element (null if none / unsupported)
+_RESOLVE_LOCATORS_JS = """
+return arguments[0].map(([by, value]) => {
+  try {
+    if (by === 'id') { return document.getElementById(value); }
+    if (by === 'name') { return document.getElementsByName(value)[0] || null; }
+    if (by === 'css selector' || by === 'css') { return document.querySelector(value); }
+    if (by === 'class name') { return document.getElementsByClassName(value)[0] || null; }
+    if (by === 'xpath') {
+      return document.evaluate(value, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+    }
+  } catch (e) {}
+  return null;
+});
+"""
+
+# Runs in the page: true once a clicked option (or the control its label points at) shows as
+# selected. Elements with no selection state count as done immediately, so they never wait.
+_OPTION_SELECTED_JS = """
+const el = arguments[0];
+const t = el.control || el;
+const stateful = t.type === 'radio' || t.type === 'checkbox' || t.tagName === 'OPTION'
+  || t.hasAttribute('aria-checked') || t.hasAttribute('aria-pressed') || t.hasAttribute('aria-selected');
+if (!stateful) { return true; }
+return t.checked === true || t.selected === true || t.getAttribute('aria-checked') === 'true'
+  || t.getAttribute('aria-pressed') === 'true' || t.getAttribute('aria-selected') === 'true';
+"""
+
+
+# AI prompt template (filled by analyze_large_html_with_ai: profile, chunk, summary, chunk_num, total_chunks).
+# It has no job details, so the analysis of a form is cached once and reused for every posting
+# that uses it. The text is part of the AI cache keys; editing it invalidates cached analyses.
+_FORM_ANALYSIS_PROMPT = """Analyze this chunk of a job application form. In ONE response, identify:
+- "fields": standard applicant fields (name, email, phone, LinkedIn, GitHub, website, location)
+- "questions": every other question (work authorization, salary, motivation, custom company questions)
+- "resume_input": the file input for uploading a RESUME/CV, if in this chunk
+- "cover_letter_input": the file input for uploading a COVER LETTER, if in this chunk
+EEO/demographic questions (gender, race, veteran, disability) are handled separately; leave them out.
+
+For every field and question:
+1. Provide exact locator as a list ["type", "value"] (e.g., ["id", "full_name"] or ["xpath", "//input[@name='firstName']"])
+2. Mark if required (true/false)
+3. Fields: suggest value from profile or generate if missing
+4. Questions: give the question text, its type ("text", "textarea", "radio", "checkbox", "select") and a concise, professional answer based on the profile
+5. Radio/checkbox: the locator must point to the specific option to select, and the answer is that option's value/text
+6. Text/textarea questions whose answer depends on the specific job or company (e.g. "Why do you want to work here?"): set "answer" to null and "job_specific" to true
+
+Current Profile:
+{profile}
+
+Form Chunk (JSON list of the form's controls with tag/type/id/name/label/group, or raw HTML):
+{chunk}
+
+Summary of previous processing: {summary}
+Chunk {chunk_num} of {total_chunks}
+
+IMPORTANT: Your response must be VALID JSON between ```json ``` markers.
+Do NOT include any other text outside these markers. Use empty lists / null for anything not in this chunk.
+
+Example response:
+```json
+{{
+    "fields": [
+        {{
+            "label": "Full Name",
+            "type": "text",
+            "required": true,
+            "locator": ["id", "full_name"],
+            "value": "John Doe",
+            "source": "profile"
+        }}
+    ],
+    "questions": [
+        {{
+            "text": "Are you authorized to work in the US?",
+            "type": "radio",
+            "required": true,
+            "locator": ["xpath", "//input[@name='work_auth' and @value='Yes']"],
+            "answer": "Yes",
+            "source": "profile_or_generated"
+        }}
+    ],
+    "resume_input": {{"field_label": "Resume/CV", "locator": ["id", "resume"]}},
+    "cover_letter_input": null,
+    "summary": "Processed personal info, work authorization and the resume input"
+}}
+```"""
+
+# Answers for the questions the form analysis marked job_specific; one prompt per application
+_JOB_ANSWERS_PROMPT = """Answer these job application questions for the job below, concisely and professionally,
+based on the candidate's profile.
+
+Current Profile:
+{profile}
+
+Job Details:
+{job}
+
+Questions (JSON list):
+{questions}
+
+IMPORTANT: Your response must be VALID JSON between ```json ``` markers, with one answer per question, in order:
+```json
+{{"answers": ["..."]}}
+```"""
+
 
 class GreenhouseFiller(BaseFiller):
     """Complete Greenhouse implementation with chunked AI processing"""
-    
-    logger = logging.getLogger(__name__) # This will use GreenhouseFiller as the logger name
 
     DEFAULT_FILE_INPUT_LOCATOR = (By.XPATH, "//input[@type='file' and contains(@accept, 'pdf')]")
     
@@ -41,6 +244,22 @@ class GreenhouseFiller(BaseFiller):
         "confirmation_message": (By.XPATH, "//*[contains(., 'Application Submitted')]"),
     }
 
+    # Submit button strategies for review_and_submit, tried in order
+    SUBMIT_BUTTON_LOCATORS = (
+        (By.XPATH, "//button[@type='submit' and (contains(., 'Submit Application') or contains(., 'Submit'))]"),
+        (By.XPATH, "//input[@type='submit' and (contains(@value, 'Submit Application') or contains(@value, 'Submit'))]"),
+        (By.ID, "submit_button"), # Common ID
+    )
+
+    # Post-submit confirmation strategies for review_and_submit, tried in order
+    CONFIRMATION_LOCATORS = (
+        LOCATORS["confirmation_message"],
+        (By.XPATH, "//*[contains(text(), 'Thank you for your application')]"),
+        (By.XPATH, "//*[contains(text(), 'Application received')]"),
+        (By.XPATH, "//*[contains(text(), 'Successfully submitted')]"),
+        (By.XPATH, "//*[contains(text(), 'Your application has been submitted')]"),
+    )
+
     # Field type handlers
     FIELD_HANDLERS = {
         "text": "_fill_text_field",
@@ -50,11 +269,28 @@ class GreenhouseFiller(BaseFiller):
         "file": "_fill_file_field"
     }
 
+    # Custom question type -> answer method (see _answer_ai_questions)
+    QUESTION_HANDLERS = {
+        "text": "_answer_text_question",
+        "textarea": "_answer_text_question",
+        "radio": "_answer_option_question",
+        "checkbox": "_answer_option_question",
+        "select": "_answer_select_question",
+    }
+
     def __init__(self, driver, job_data, user_profile, document_paths, credentials=None):
         super().__init__(driver, job_data, user_profile, document_paths, credentials)
-        self._form_analysis = None
+        # Result of _analyze_form_with_ai: fields, questions and document inputs from one AI pass
+        self._form_analysis: Optional[Dict[str, Any]] = None
+        # (page URL, element id, outerHTML) of the last element serialized by _get_outer_html
+        self._outer_html_cache: Optional[Tuple[str, str, str]] = None
+        # Field type -> bound handler, resolved once instead of getattr per field
+        self._handlers = {field_type: getattr(self, name) for field_type, name in self.FIELD_HANDLERS.items()}
+        self._question_handlers = {q_type: getattr(self, name) for q_type, name in self.QUESTION_HANDLERS.items()}
+        # String form of the job id, validated once (log prefix, AI cache keys, locator logs)
+        self._job_id_str = self._validate_job_id(self.job_data.get('job_id'))
         # Update log_prefix for this specific filler instance
-        self.log_prefix = f"[GreenhouseFiller - JobID: {self._validate_job_id(self.job_data.get('job_id'))}] "
+        self.log_prefix = f"[GreenhouseFiller - JobID: {self._job_id_str}] "
 
 
     def _validate_job_id(self, job_id) -> str:
@@ -68,82 +304,190 @@ class GreenhouseFiller(BaseFiller):
         
     def _safe_json_dumps(self, data: Any, max_length: int = 2000) -> str:
         """Safely convert data to JSON with length limit"""
+        if orjson is not None:
+            try:
+                # Same coercions as _safe_serialize (ObjectId/unknown -> str, datetime -> ISO) without the copy
+                return orjson.dumps(data, default=str, option=orjson.OPT_NON_STR_KEYS).decode()[:max_length]
+            except orjson.JSONEncodeError:
+                pass # e.g. int beyond 64 bits; the pure-Python path below handles it
         try:
-            return json.dumps(self._safe_serialize(data))[:max_length]
+            try:
+                # Profiles loaded from YAML/JSON are already clean: one C-level dump, no copy
+                return json.dumps(data)[:max_length]
+            except TypeError:
+                # ObjectId/datetime somewhere inside; sanitize a copy
+                return json.dumps(self._safe_serialize(data))[:max_length]
         except Exception as e:
             self.logger.warning(f"{self.log_prefix}JSON serialization warning: {str(e)}")
             return "{}"
 
-    def fill_basic_info(self) -> bool:
-        """AI-powered basic info filling with chunked processing"""
+    def _get_outer_html(self, element: WebElement) -> str:
+        """
+        element's outerHTML, reused while the page URL is unchanged. The application form is
+        serialized by several steps (basic info fallback, resume AI fallback, custom questions
+        fallback); this fetches it from the browser once per page load. WebElement ids are
+        compared locally, so a hit costs only the current_url call.
+        """
+        current_url = self.driver.current_url
+        cached = self._outer_html_cache
+        if cached and cached[0] == current_url and cached[1] == element.id:
+            return cached[2]
+        # A one-line script instead of get_attribute, which ships Selenium's getAttribute atom each call
+        outer_html = self.driver.execute_script("return arguments[0].outerHTML;", element)
+        self._outer_html_cache = (current_url, element.id, outer_html)
+        return outer_html
+
+    def _get_outer_html_fast(self, css_selector: str) -> Optional[str]:
+        """
+        outerHTML of the first element matching css_selector. On Chromium this is a single
+        CDP Runtime.evaluate call (no find_element round-trip); other drivers, or a miss,
+        go through find_element + _get_outer_html. None if the element isn't on the page.
+        """
         try:
-            form = self.find_element(self.LOCATORS["application_form"], fatal=True, element_name="Application Form")
-            if not form: return False # Should be handled by fatal=True in find_element
-            form_html = form.get_attribute('outerHTML')
-
-            prompt = """Analyze this form chunk and identify fields to fill. Focus on:
-- Personal info (name, email, phone)
-- Professional info (LinkedIn, GitHub)
-- Location details
+            result = self.driver.execute_cdp_cmd("Runtime.evaluate", {
+                "expression": f"(document.querySelector({json.dumps(css_selector)}) || {{}}).outerHTML",
+                "returnByValue": True,
+            })
+            outer_html = result.get("result", {}).get("value")
+            if outer_html:
+                return outer_html
+        except (AttributeError, WebDriverException) as e: # Not a Chromium driver / CDP unavailable
+            self.logger.debug(f"{self.log_prefix}CDP outerHTML unavailable, using Selenium: {e}")
+        element = self.find_element((By.CSS_SELECTOR, css_selector), fatal=False, element_name=css_selector)
+        return self._get_outer_html(element) if element else None
+
+    def _scan_form_controls(self, root: Optional[WebElement] = None) -> Optional[List[Dict[str, Any]]]:
+        """
+        Enumerate the form's inputs/selects/textareas in the browser with one execute_script
+        call (see _FORM_SCAN_JS). None if the scan fails or finds nothing.
+        """
+        try:
+            controls = self.driver.execute_script(_FORM_SCAN_JS, root)
+        except WebDriverException as e:
+            self.logger.warning(f"{self.log_prefix}In-page form scan failed: {e}")
+            return None
+        return controls or None
 
-For each field:
-1. Provide exact locator as a list ["type", "value"] (e.g., ["id", "full_name"] or ["xpath", "//input[@name='firstName']"])
-2. Mark if required (true/false)
-3. Suggest value from profile or generate if missing
-4. For sensitive fields, recommend 'prefer not to say'
+    def _scan_form_js(self, root: Optional[WebElement] = None) -> Optional[str]:
+        """
+        The form's controls as compact JSON (None if the scan fails or finds nothing).
+        Much smaller than the outerHTML for the AI prompt, and one WebDriver round-trip.
+        """
+        controls = self._scan_form_controls(root)
+        if not controls:
+            return None
+        return json.dumps(controls, separators=(',', ':'))
 
-Current Profile:
-{profile}
+    def _file_input_by_text(self, phrase: str) -> Optional[Tuple[str, str]]:
+        """
+        Locator of the first file input whose label or surrounding field text (e.g. an
+        "Upload resume" button) contains phrase (lowercase). Matched here on the scanned
+        controls rather than with a case-folding translate() XPath over every node.
+        """
+        for control in self._scan_form_controls() or ():
+            if control.get("type") != "file":
+                continue
+            text = f"{control.get('label') or ''} {control.get('group') or ''}".lower()
+            if phrase not in text:
+                continue
+            if control.get("id"):
+                return (By.ID, control["id"])
+            if control.get("name"):
+                return (By.NAME, control["name"])
+        return None
 
-Job Details:
-{job}
+    def _analyze_form_with_ai(self) -> Dict[str, Any]:
+        """
+        One AI pass over the whole application form, returning the basic-info fields, custom
+        questions and resume/cover-letter inputs together (see _FORM_ANALYSIS_PROMPT). Run
+        once per application; the steps after fill_basic_info read the stored result instead
+        of each sending their own prompt. Raises ApplicationError if the form isn't on the page.
+        """
+        if self._form_analysis is not None:
+            return self._form_analysis
 
-HTML Chunk:
-{chunk}
+        # Compact field list from one in-page scan; outerHTML only if the scan fails
+        form_html = self._scan_form_js() or self._get_outer_html_fast("#application_form")
+        if not form_html:
+            self.logger.error(f"{self.log_prefix}Application form not found, cannot analyze it.")
+            raise ApplicationError("Application Form not found.")
 
-Summary of previous processing: {summary}
-Chunk {chunk_num} of {total_chunks}
+        analysis = self.analyze_large_html_with_ai(
+            form_html,
+            _FORM_ANALYSIS_PROMPT,
+            cache_key="form_full",
+            independent_chunks=True, # Each chunk's fields/questions stand alone; no summary chaining needed
+            job_independent=True # Keyed by the form and profile, so other postings on this form reuse it
+        )
+        if "error" in analysis:
+            return analysis # Not stored: a later step may retry
+        analysis = self._with_job_specific_answers(analysis)
+
+        for context, items, label_key in (("Greenhouse Basic Info Form", analysis.get("fields", []), "label"),
+                                          ("Greenhouse Custom Questions", analysis.get("questions", []), "text")):
+            for item in items:
+                if isinstance(item, dict) and item.get("locator"):
+                    self._log_ai_locator(
+                        label=item.get(label_key, "Unknown Field"),
+                        locator=item["locator"], # Expected format: ["type", "value"]
+                        context=context,
+                        ats_platform="Greenhouse",
+                        job_id_str=self._job_id_str
+                    )
+        self._form_analysis = analysis
+        return analysis
 
-IMPORTANT: Your response must be VALID JSON between ```json ``` markers.
-Do NOT include any other text outside these markers.
+    def _with_job_specific_answers(self, analysis: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Copy of analysis with the answers of its job_specific questions filled in by one
+        _JOB_ANSWERS_PROMPT call. The analysis itself may be the cached one shared with other
+        jobs, so it is never modified. On failure those questions keep a null answer.
+        """
+        questions = analysis.get("questions") or []
+        pending = [i for i, q in enumerate(questions)
+                   if isinstance(q, dict) and q.get("job_specific") and q.get("answer") is None]
+        if not pending:
+            return analysis
+
+        prompt = _JOB_ANSWERS_PROMPT.format(
+            profile=self._get_safe_profile_json_for_prompt(),
+            job=self._get_safe_job_json_for_prompt(),
+            questions=json.dumps([questions[i].get("text", "") for i in pending]),
+        )
+        parsed, error = self._request_chunk_analysis(prompt, 1, 1, len(prompt), f"job_answers_{self._job_id_str}")
+        answers = parsed.get("answers") if isinstance(parsed, dict) else None
+        if error or not isinstance(answers, list):
+            self.logger.warning(f"{self.log_prefix}Could not answer {len(pending)} job-specific questions: {error or parsed}")
+            return analysis
+
+        questions = list(questions)
+        for i, answer in zip(pending, answers):
+            questions[i] = {**questions[i], "answer": answer}
+        return {**analysis, "questions": questions}
+
+    def _form_document_locator(self, key: str) -> Optional[Tuple[str, str]]:
+        """(by, value) of the resume_input / cover_letter_input found by _analyze_form_with_ai, if any"""
+        try:
+            analysis = self._analyze_form_with_ai()
+        except ApplicationError:
+            return None # Form gone; callers report the missing upload field themselves
+        document_input = analysis.get(key)
+        locator = document_input.get("locator") if isinstance(document_input, dict) else None
+        if not (isinstance(locator, (list, tuple)) and len(locator) == 2):
+            return None
+        self._log_ai_locator(
+            label=document_input.get("field_label", f"{key} (AI-identified)"),
+            locator=locator,
+            context=f"Greenhouse {key} (AI)",
+            ats_platform="Greenhouse",
+            job_id_str=self._job_id_str
+        )
+        return (str(locator[0]).lower(), str(locator[1]))
 
-Example response:
-```json
-{{
-    "fields": [
-        {{
-            "label": "Full Name",
-            "type": "text",
-            "required": true,
-            "locator": ["id", "full_name"],
-            "value": "John Doe",
-            "source": "profile"
-        }}
-    ],
-    "summary": "Processed personal info fields"
-}}
-```"""
-            
-            validated_job_id = self._validate_job_id(self.job_data.get('job_id'))
-            analysis = self.analyze_large_html_with_ai(
-                form_html,
-                prompt,
-                cache_key=f"basic_info_{validated_job_id}"
-            )
-            self._form_analysis = analysis
-
-            if analysis and "fields" in analysis:
-                for field_data in analysis.get("fields", []):
-                    if "locator" in field_data and field_data["locator"]:
-                        # Ensure field_data["locator"] is a list, e.g. ["id", "value"]
-                        self._log_ai_locator(
-                            label=field_data.get("label", "Unknown Basic Info Field"),
-                            locator=field_data["locator"], # Expected format: ["type", "value"]
-                            context="Greenhouse Basic Info Form",
-                            ats_platform="Greenhouse",
-                            job_id_str=validated_job_id
-                        )
-            
+    def fill_basic_info(self) -> bool:
+        """AI-powered basic info filling with chunked processing"""
+        try:
+            analysis = self._analyze_form_with_ai()
             return self._execute_field_instructions(analysis.get("fields", []))
         except ApplicationError as e: # Catch specific application errors
             self.logger.error(f"{self.log_prefix}Basic info filling failed (ApplicationError): {e.message}", exc_info=False)
@@ -189,29 +533,8 @@ Example response:
             if not self._handle_eeo_questions(): # Check return value
                  self.logger.warning(f"{self.log_prefix}EEO question handling encountered issues or no questions found.")
             
-            # Then analyze custom questions with AI
-            # Using a more generic class that might contain custom questions
-            questions_section_locator = (By.XPATH, "//*[contains(@id, 'custom_fields')] | //*[contains(@class, 'custom-questions')] | //form[@id='application_form']//div[contains(@class,'field') or contains(@class,'question')]")
-            
-            questions_section = self.find_element(
-                questions_section_locator,
-                wait_time=5, # Short wait, might not always exist
-                fatal=False, # Don't fail if no specific custom questions section is obvious
-                element_name="Custom Questions Section"
-            )
-            
-            # If a specific section isn't found, use the whole form for question analysis
-            # This is a fallback, assuming custom questions might be interspersed
-            if not questions_section:
-                self.logger.info(f"{self.log_prefix}No distinct custom questions section found by specific locator, will analyze whole form for custom questions.")
-                form_element = self.find_element(self.LOCATORS["application_form"], fatal=False, element_name="Application Form for Custom Questions")
-                if form_element:
-                    questions_section = form_element
-                else:
-                    self.logger.warning(f"{self.log_prefix}Application form not found for custom question analysis. Skipping AI custom questions.")
-                    return True # No section to analyze means no custom questions to fail on here
-
-            return self._handle_custom_questions_with_ai(questions_section)
+            # Then answer the custom questions found by the form analysis
+            return self._handle_custom_questions_with_ai()
 
         except ApplicationError as e:
             self.logger.error(f"{self.log_prefix}Custom questions step failed (ApplicationError): {e.message}", exc_info=False)
@@ -225,24 +548,9 @@ Example response:
         try:
             # Scroll through form to trigger any validation
             self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-            time.sleep(0.5) # Brief pause for scroll
             self.driver.execute_script("window.scrollTo(0, 0);") # Scroll back to top
-            time.sleep(0.5) # Brief pause
 
-            # More robust submit button locator
-            submit_button_locators = [
-                (By.XPATH, "//button[@type='submit' and (contains(., 'Submit Application') or contains(., 'Submit'))]"),
-                (By.XPATH, "//input[@type='submit' and (contains(@value, 'Submit Application') or contains(@value, 'Submit'))]"),
-                (By.ID, "submit_button"), # Common ID
-            ]
-            
-            submit_button_element = None
-            for i, locator in enumerate(submit_button_locators):
-                self.logger.info(f"{self.log_prefix}Trying submit button locator strategy {i+1}: {locator}")
-                submit_button_element = self.find_element(locator, wait_time=5, fatal=False, element_name=f"Submit Button (Strategy {i+1})")
-                if submit_button_element:
-                    break
-            
+            submit_button_element = self._wait_for_submit_button()
             if not submit_button_element:
                 self.logger.error(f"{self.log_prefix}Submit button not found with any strategy.")
                 raise ApplicationError("Submit button not found.")
@@ -254,17 +562,8 @@ Example response:
             # Verify submission
             time.sleep(config.TIMEOUTS.get("SUBMISSION_CONFIRMATION", 5)) # Use configured timeout
             
-            # More robust confirmation message check
-            confirmation_locators = [
-                self.LOCATORS["confirmation_message"],
-                (By.XPATH, "//*[contains(text(), 'Thank you for your application')]"),
-                (By.XPATH, "//*[contains(text(), 'Application received')]"),
-                (By.XPATH, "//*[contains(text(), 'Successfully submitted')]"),
-                (By.XPATH, "//*[contains(text(), 'Your application has been submitted')]"),
-            ]
-
             confirmed = False
-            for i, locator in enumerate(confirmation_locators):
+            for i, locator in enumerate(self.CONFIRMATION_LOCATORS):
                 self.logger.info(f"{self.log_prefix}Trying confirmation message locator strategy {i+1}: {locator}")
                 if self.find_element(locator, wait_time=5, fatal=False, element_name=f"Confirmation Message (Strategy {i+1})"):
                     confirmed = True
@@ -292,31 +591,89 @@ Example response:
             return False
 
     # AI-powered implementation details
+    def _resolve_locators_batch(self, locators: List[List[str]]) -> List[Optional[WebElement]]:
+        """
+        Resolve [by, value] locators to WebElements in one execute_script round-trip
+        (None where nothing matched). All None if the script fails; callers then find
+        each element by its locator as before.
+        """
+        if not locators:
+            return []
+        try:
+            resolved = self.driver.execute_script(_RESOLVE_LOCATORS_JS, locators)
+        except WebDriverException as e:
+            self.logger.warning(f"{self.log_prefix}Batch locator resolution failed, finding fields one by one: {e}")
+            return [None] * len(locators)
+        if not isinstance(resolved, list) or len(resolved) != len(locators):
+            return [None] * len(locators)
+        return [el if isinstance(el, WebElement) else None for el in resolved]
+
+    @staticmethod
+    def _is_stale(element: WebElement) -> bool:
+        """Whether element is detached from the DOM"""
+        try:
+            element.is_enabled()
+            return False
+        except StaleElementReferenceException:
+            return True
+        except WebDriverException:
+            return False
+
+    @staticmethod
+    def _field_target(field: Dict):
+        """Element resolved by _execute_field_instructions, else the field's (by, value) locator"""
+        return field.get("_resolved") or tuple(field["locator"])
+
+    @staticmethod
+    def _is_autocomplete_field(field: Dict) -> bool:
+        """Whether the field's label or locator names an autocomplete input (location, school)"""
+        text = f"{field.get('label', '')} {field['locator'][1]}".lower()
+        return any(hint in text for hint in _AUTOCOMPLETE_FIELD_HINTS)
+
     def _execute_field_instructions(self, fields: List[Dict]) -> bool:
         """Execute field filling instructions from AI"""
         if not fields:
             self.logger.info(f"{self.log_prefix}No field instructions to execute.")
             return True # No fields means success in doing nothing.
 
+        # Validate once here; the _fill_* handlers can then rely on a dict with a [by, value] locator
         all_successful = True
+        valid_fields = []
+        for field in fields:
+            if isinstance(field, dict) and isinstance(field.get("locator"), (list, tuple)) and len(field["locator"]) == 2:
+                valid_fields.append(field)
+                continue
+            self.logger.error(f"{self.log_prefix}Invalid field format from AI, skipping: {field}")
+            if isinstance(field, dict) and field.get("required", False):
+                all_successful = False
+
+        # Resolve every locator up front in one round-trip. Fields are copied, not annotated in
+        # place: the analysis dict lives in the AI cache and must not hold WebElements.
+        resolved = self._resolve_locators_batch(
+            [[str(f["locator"][0]).lower(), str(f["locator"][1])] for f in valid_fields]
+        )
+        fields = [
+            {**field, "_resolved": element} if element is not None else field
+            for field, element in zip(valid_fields, resolved)
+        ]
+
         for field in fields:
             try:
                 field_label = field.get("label", "Unknown field")
                 field_type = field.get("type")
                 
-                handler_name = self.FIELD_HANDLERS.get(field_type)
-                if not handler_name:
+                handler_method = self._handlers.get(field_type)
+                if not handler_method:
                     self.logger.warning(f"{self.log_prefix}No handler for field type: {field_type} (Label: {field_label})")
                     continue # Skip this field, don't mark as failure for the whole process unless critical
-                    
-                handler_method = getattr(self, handler_name, None)
-                if not handler_method:
-                    self.logger.error(f"{self.log_prefix}Handler method {handler_name} not found for type {field_type}.")
-                    all_successful = False # This is a programming error
-                    continue
 
                 self.logger.info(f"{self.log_prefix}Processing field '{field_label}' (Type: {field_type})")
-                if not handler_method(field): # Pass the whole field dict
+                filled = handler_method(field) # Pass the whole field dict
+                if not filled and field.get("_resolved") is not None and self._is_stale(field["_resolved"]):
+                    # Pre-resolved element was re-rendered after the batch lookup; retry by locator
+                    field = {k: v for k, v in field.items() if k != "_resolved"}
+                    filled = handler_method(field)
+                if not filled:
                     self.logger.warning(f"{self.log_prefix}Failed to fill field: '{field_label}' (Type: {field_type}). Required: {field.get('required', False)}")
                     if field.get("required", False): # Only mark as overall failure if a required field fails
                         all_successful = False
@@ -347,8 +704,8 @@ Example response:
             return str(data) # Fallback to string representation
 
     # Override methods from BaseFiller
-    def _get_safe_profile_json_for_prompt(self) -> str:
-        # self.logger.debug(f"{self.log_prefix}GreenhouseFiller: Overriding _get_safe_profile_json_for_prompt. Using self._safe_json_dumps.")
+    def _build_profile_json_for_prompt(self) -> str:
+        # self.logger.debug(f"{self.log_prefix}GreenhouseFiller: Overriding _build_profile_json_for_prompt. Using self._safe_json_dumps.")
         # self.logger.debug(f"{self.log_prefix}GreenhouseFiller: user_profile before _safe_json_dumps (first 200 chars): {str(self.user_profile)[:200]}")
         # Use a reasonable max length, e.g., from a config or a smaller portion of MAX_HTML_CHUNK_SIZE
         profile_max_len = getattr(config, "AI_PROMPT_PROFILE_MAX_LEN", 3000)
@@ -356,8 +713,8 @@ Example response:
         # self.logger.debug(f"{self.log_prefix}GreenhouseFiller: user_profile after _safe_json_dumps (first 200 chars): {serialized_profile_data[:200]}")
         return serialized_profile_data
 
-    def _get_safe_job_json_for_prompt(self) -> str:
-        # self.logger.debug(f"{self.log_prefix}GreenhouseFiller: Overriding _get_safe_job_json_for_prompt. Using self._safe_json_dumps.")
+    def _build_job_json_for_prompt(self) -> str:
+        # self.logger.debug(f"{self.log_prefix}GreenhouseFiller: Overriding _build_job_json_for_prompt. Using self._safe_json_dumps.")
         job_id_val = self.job_data.get('job_id')
         # if isinstance(job_id_val, ObjectId): 
         #     self.logger.info(f"{self.log_prefix}GreenhouseFiller: job_data contains ObjectId for job_id: {job_id_val}")
@@ -367,195 +724,105 @@ Example response:
         # self.logger.debug(f"{self.log_prefix}GreenhouseFiller: job_data after _safe_json_dumps (first 200 chars): {serialized_job_data[:200]}")
         return serialized_job_data
     
+    def _wait_for_option_selected(self, element: WebElement, timeout: float = 1.0) -> None:
+        """Wait (up to timeout) for a clicked option to register as selected, instead of a fixed sleep"""
+        try:
+            WebDriverWait(self.driver, timeout, poll_frequency=self.WAIT_POLL_FREQUENCY).until(
+                lambda d: d.execute_script(_OPTION_SELECTED_JS, element)
+            )
+        except (TimeoutException, StaleElementReferenceException):
+            pass # Not confirmed in time / re-rendered; carry on as the fixed pause did
+
+    def _wait_for_submit_button(self, timeout: float = 10.0) -> Optional[WebElement]:
+        """
+        First visible, enabled element matching SUBMIT_BUTTON_LOCATORS (in order), polled until
+        timeout; None if none became clickable. Validation re-renders triggered by the scroll
+        settle within this wait instead of a fixed pause.
+        """
+        def _clickable_submit(driver):
+            for locator in self.SUBMIT_BUTTON_LOCATORS:
+                for element in driver.find_elements(*locator):
+                    try:
+                        if element.is_displayed() and element.is_enabled():
+                            return element
+                    except StaleElementReferenceException:
+                        continue
+            return False
+
+        try:
+            return WebDriverWait(self.driver, timeout, poll_frequency=self.WAIT_POLL_FREQUENCY).until(_clickable_submit)
+        except TimeoutException:
+            return None
+
+    def _js_click(self, element: WebElement) -> bool:
+        """
+        Scroll element into view and click it in ONE execute_script round-trip (vs. separate
+        scroll / wait / click calls in click_element). False if the script fails, so callers
+        can fall back to click_element.
+        """
+        try:
+            return bool(self.driver.execute_script(
+                "arguments[0].scrollIntoView({block: 'center'}); arguments[0].click(); return true;", element
+            ))
+        except WebDriverException as e:
+            self.logger.debug(f"{self.log_prefix}JS click failed, falling back to click_element: {e}")
+            return False
+
     def _handle_eeo_questions(self) -> bool:
         """Standard EEO question handling by selecting 'decline' or 'prefer not to say'."""
-        self.logger.info(f"{self.log_prefix}Handling EEO questions.")
-        # More comprehensive list of phrases indicating decline/prefer not to say
-        decline_phrases = [
-            "decline to self-identify", "prefer not to say", "i don't wish to answer",
-            "choose not to disclose", "do not wish to provide", "decline to answer"
-        ]
-        
-        # Construct XPath to find elements containing any of the decline phrases,
-        # specifically looking for clickable inputs (radio/checkbox) or options within selects.
-        # This targets labels often associated with radio buttons or options.
-        # It's crucial that these elements are interactable.
-
-        base_xpath_label_contains = "//*[self::label or self::span or self::div][({conditions}) and not(ancestor::*[contains(@style,'display:none')]) and not(ancestor::*[contains(@hidden, 'true')])]"
-        
-        condition_parts = [f"contains(normalize-space(translate(., 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz')), '{phrase}')" for phrase in decline_phrases]
-        full_conditions = " or ".join(condition_parts)
-        
-        # XPath for clickable elements (input type radio/checkbox) whose associated label (or themselves if value attr) matches
-        # This is complex because the actual clickable element might be an input, and the text in a sibling/parent label.
-        # Strategy 1: Find inputs whose *value* attribute matches common decline values (e.g., for radio buttons)
-        # Strategy 2: Find labels with decline text, then try to click associated input or the label itself.
+        log, prefix = self.logger, self.log_prefix # Bound once; the option loop logs per click
+        log.info(f"{prefix}Handling EEO questions.")
+        # Section and decline-option XPaths are module constants (_EEO_*), built once at import
 
         overall_success = True
         elements_clicked_count = 0
 
-        # Try finding elements by common patterns (more targeted)
-        # Common pattern: a radio button or checkbox input
-        # Looking for an input that is a sibling or child of a label containing the text, or the label itself
-        # This can be very specific to HTML structures.
-
-        # A simpler, more direct approach: find elements (buttons, links, radio labels) containing the text directly
-        generic_clickable_xpath = "//(button|a|label|span)[{conditions}] | //input[@type='radio' or @type='checkbox'][@value/following-sibling::label[{conditions}]]"
-        
-        # Prioritize more specific selectors for common EEO structures like radio groups
-        eeo_sections_xpaths = [
-            "//div[contains(@class, 'eeo')]", # Common class for EEO sections
-            "//fieldset[.//legend[contains(translate(., 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz'), 'equal opportunity')]]", # Fieldset with EEO legend
-            "//div[h3|h4|h5|legend[contains(translate(., 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz'),'gender') or contains(translate(., 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz'),'race') or contains(translate(., 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz'),'ethnicity') or contains(translate(., 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz'),'veteran') or contains(translate(., 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz'),'disability')]]"
-        ]
-
         eeo_elements_found_in_sections = False
-        for section_xpath in eeo_sections_xpaths:
-            sections = self.driver.find_elements(By.XPATH, section_xpath)
-            if not sections:
-                continue
-            
-            self.logger.info(f"{self.log_prefix}Found potential EEO section(s) with XPath: {section_xpath}")
-            for section in sections:
-                for phrase in decline_phrases:
-                    # Try to find clickable elements within this section
-                    # 1. Inputs (radio/checkbox) where a *following or parent label* contains the phrase
-                    #    This is tricky with generic XPath. Let's try finding labels first.
-                    decline_labels_in_section = section.find_elements(By.XPATH, f".//label[contains(normalize-space(translate(., 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz')), '{phrase.lower()}')]")
-                    for label in decline_labels_in_section:
-                        try:
-                            # Try to click the label first, as it often triggers the associated input
-                            if self.click_element(label, wait_time=1, desc=f"EEO Decline Label ('{phrase}')", fatal=False, scroll_into_view=True):
-                                self.logger.info(f"{self.log_prefix}Clicked EEO decline option (label): '{phrase}'")
-                                elements_clicked_count +=1
-                                eeo_elements_found_in_sections = True
-                                time.sleep(0.3) # Pause after click
-                                continue # Move to next phrase or section
-                            
-                            # If label click fails or is not desired, try finding associated input
-                            input_id = label.get_attribute("for")
-                            if input_id:
-                                associated_input = self.find_element((By.ID, input_id), wait_time=1, fatal=False)
-                                if associated_input and self.click_element(associated_input, wait_time=1, desc=f"EEO Decline Input for '{phrase}'", fatal=False, scroll_into_view=True):
-                                    self.logger.info(f"{self.log_prefix}Clicked EEO decline option (associated input): '{phrase}'")
-                                    elements_clicked_count +=1
-                                    eeo_elements_found_in_sections = True
-                                    time.sleep(0.3)
-                                    continue
-                        except Exception as e_click:
-                            self.logger.warning(f"{self.log_prefix}Minor issue clicking EEO element for phrase '{phrase}': {e_click}")
-                    
-                    # 2. Direct clickable elements (button, a) containing the phrase
-                    decline_buttons_in_section = section.find_elements(By.XPATH, f".//(button|a)[contains(normalize-space(translate(text(), 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz')), '{phrase.lower()}')]")
-                    for button_like in decline_buttons_in_section:
-                        if self.click_element(button_like, wait_time=1, desc=f"EEO Decline Button/Link ('{phrase}')", fatal=False, scroll_into_view=True):
-                            self.logger.info(f"{self.log_prefix}Clicked EEO decline option (button/link): '{phrase}'")
-                            elements_clicked_count +=1
-                            eeo_elements_found_in_sections = True
-                            time.sleep(0.3)
-                            break # Assuming one click per phrase type is enough for that section
+        decline_options = self.driver.find_elements(By.XPATH, _EEO_DECLINE_OPTIONS_XPATH)
+        if decline_options:
+            log.info(f"{prefix}Found {len(decline_options)} EEO decline option(s).")
+        # Labels often trigger their associated radio/checkbox; buttons/links are clicked directly
+        for option in decline_options:
+            try:
+                if self._js_click(option) or self.click_element(option, wait_time=1, desc="EEO Decline Option", fatal=False, scroll_into_view=True):
+                    log.info(f"{prefix}Clicked EEO decline option.")
+                    elements_clicked_count +=1
+                    eeo_elements_found_in_sections = True
+                    self._wait_for_option_selected(option)
+                    continue
+
+                # If the label click fails, try the input it points at (buttons/links have no 'for')
+                input_id = option.get_attribute("for")
+                if input_id:
+                    associated_input = self.find_element((By.ID, input_id), wait_time=1, fatal=False)
+                    if associated_input and (self._js_click(associated_input) or self.click_element(associated_input, wait_time=1, desc="EEO Decline Input", fatal=False, scroll_into_view=True)):
+                        log.info(f"{prefix}Clicked EEO decline option (associated input).")
+                        elements_clicked_count +=1
+                        eeo_elements_found_in_sections = True
+                        self._wait_for_option_selected(associated_input)
+            except Exception as e_click:
+                log.warning(f"{prefix}Minor issue clicking EEO decline element: {e_click}")
 
         if elements_clicked_count > 0:
-            self.logger.info(f"{self.log_prefix}Successfully clicked {elements_clicked_count} EEO 'decline/prefer not to say' options.")
+            log.info(f"{prefix}Successfully clicked {elements_clicked_count} EEO 'decline/prefer not to say' options.")
             return True
         
         if not eeo_elements_found_in_sections:
-             self.logger.info(f"{self.log_prefix}No specific EEO decline/prefer not to say options found or clicked in identified sections. This might be okay if questions are not present.")
+             log.info(f"{prefix}No specific EEO decline/prefer not to say options found or clicked in identified sections. This might be okay if questions are not present.")
         
         return overall_success # Returns true if no errors, even if no elements clicked (might be no EEO)
 
-    def _handle_custom_questions_with_ai(self, section: WebElement) -> bool:
-        """Analyze and answer custom questions with chunked AI processing"""
-        if not section:
-            self.logger.info(f"{self.log_prefix}No section provided for custom question analysis.")
-            return True # No questions to answer here
+    def _handle_custom_questions_with_ai(self) -> bool:
+        """Answer the custom questions identified by _analyze_form_with_ai"""
+        analysis = self._analyze_form_with_ai()
+        if analysis.get("questions"):
+            return self._answer_ai_questions(analysis["questions"])
 
-        section_html = section.get_attribute('outerHTML')
-        if not section_html or len(section_html) < 50: # Heuristic for empty/trivial section
-            self.logger.info(f"{self.log_prefix}Custom questions section HTML is trivial or empty. Skipping AI analysis for it.")
-            return True
-            
-        self.logger.info(f"{self.log_prefix}Analyzing custom questions section (HTML length: {len(section_html)}).")
-
-        prompt = """Analyze these custom job application questions from the HTML chunk:
-        
-        Job Requirements (for context):
-        {job}
-        
-        Applicant Profile (for context):
-        {profile}
-        
-        Summary from previous chunks (if any):
-        {summary}
-        
-        Current HTML Chunk of Questions ({chunk_num}/{total_chunks}):
-        {chunk}
-        
-        For each distinct question found in this chunk:
-        1. Identify the main question text/label.
-        2. Determine the question type (e.g., "text", "textarea", "radio", "checkbox", "select").
-        3. Provide an exact locator for the input field(s) or select element as a list ["type", "value"] (e.g., ["name", "question1"] or ["xpath", "//textarea[@id='q1']"]). For radio/checkbox groups, provide the locator for the specific option to select if inferable, otherwise the group.
-        4. Based on the profile and job context, generate a concise, professional answer.
-        5. If the question is sensitive (e.g., race, gender, disability) and an answer is not mandatory or can be "Prefer not to say", suggest that or an empty answer.
-        6. If it's a radio/checkbox and you need to choose an option, the "answer" should be the value/text of the option to select, and the "locator" should point to that specific option's input element.
-
-        Return a VALID JSON object between ```json ``` markers:
-        ```json
-        {{
-            "questions": [
-                {{
-                    "text": "What is your salary expectation?",
-                    "type": "text", // or "textarea"
-                    "locator": ["xpath", "//input[@name='salary_expectation']"],
-                    "answer": "Based on my experience and market rates for similar roles.",
-                    "source": "generated",
-                    "sensitive": false
-                }},
-                {{
-                    "text": "Are you authorized to work in the US?",
-                    "type": "radio", // Could be "select" or "checkbox"
-                    "locator": ["xpath", "//input[@name='work_auth' and @value='Yes']"], // Locator for the 'Yes' option
-                    "answer": "Yes", // This is the value that would be selected or typed
-                    "source": "profile_or_generated",
-                    "sensitive": false
-                }}
-            ],
-            "summary": "Identified salary and work authorization questions. Needs more processing if other chunks."
-        }}
-        ```
-        If no questions are found in this chunk, return an empty "questions" list.
-        """
-        
-        validated_job_id = self._validate_job_id(self.job_data.get('job_id'))
-        analysis = self.analyze_large_html_with_ai(
-            section_html,
-            prompt,
-            cache_key=f"custom_questions_{validated_job_id}"
-        )
-        
-        if analysis and "questions" in analysis:
-            # Log identified locators before attempting to answer
-            for question_data in analysis.get("questions", []):
-                if "locator" in question_data and question_data["locator"]:
-                    self._log_ai_locator(
-                        label=question_data.get("text", "Unknown Custom Question"),
-                        locator=question_data["locator"], # Expected ["type", "value"]
-                        context="Greenhouse Custom Questions",
-                        ats_platform="Greenhouse",
-                        job_id_str=validated_job_id
-                    )
-            return self._answer_ai_questions(analysis.get("questions", [])) # Changed to _answer_ai_questions
-        
         self.logger.info(f"{self.log_prefix}No custom questions identified by AI or analysis failed.")
         return True # If no questions, consider it a success for this step
 
-    # Field type handlers
     def _fill_text_field(self, field: Dict) -> bool:
         """Handle text input fields based on AI instruction"""
-        if not isinstance(field, dict) or "locator" not in field:
-            self.logger.error(f"{self.log_prefix}Invalid field format for _fill_text_field: {field}")
-            return False
-            
         value_to_fill = self._get_field_value(field) # Gets value from field dict or generates if needed
         if value_to_fill is None and field.get("required", False):
             self.logger.warning(f"{self.log_prefix}No value obtained for required text field: {field.get('label', 'Unknown')}")
@@ -566,18 +833,15 @@ Example response:
 
 
         return self.type_text(
-            tuple(field["locator"]), # Convert ["type", "value"] to ("type", "value")
+            self._field_target(field), # Pre-resolved element, or ["type", "value"] as ("type", "value")
             str(value_to_fill), # Ensure value is a string
             desc=field.get("label", "text field"),
-            fatal=False # Individual field failures handled by _execute_field_instructions
+            fatal=False, # Individual field failures handled by _execute_field_instructions
+            use_keystrokes=self._is_autocomplete_field(field) # Suggestions only appear on key events
         )
 
     def _fill_select_field(self, field: Dict) -> bool:
         """Handle dropdown/select fields based on AI instruction"""
-        if not isinstance(field, dict) or "locator" not in field:
-            self.logger.error(f"{self.log_prefix}Invalid field format for _fill_select_field: {field}")
-            return False
-
         value_to_select = self._get_field_value(field)
         if value_to_select is None and field.get("required", False):
             self.logger.warning(f"{self.log_prefix}No value obtained for required select field: {field.get('label', 'Unknown')}")
@@ -587,7 +851,7 @@ Example response:
             return True
             
         return self.select_dropdown_option(
-            tuple(field["locator"]),
+            self._field_target(field),
             option_text=str(value_to_select), # AI should provide the visible text to select
             desc=field.get("label", "dropdown"),
             fatal=False
@@ -595,10 +859,6 @@ Example response:
 
     def _fill_radio_field(self, field: Dict) -> bool:
         """Handle radio button fields. AI should provide locator for the specific option."""
-        if not isinstance(field, dict) or "locator" not in field:
-            self.logger.error(f"{self.log_prefix}Invalid field format for _fill_radio_field: {field}")
-            return False
-        
         # For radio, the 'value' from AI might be the value of the option to select,
         # but the 'locator' should ideally point directly to the radio button input element.
         # If AI provides a locator to a specific radio option, we just click it.
@@ -607,17 +867,13 @@ Example response:
         
         self.logger.info(f"{self.log_prefix}Attempting to click radio button for '{field.get('label', field.get('value', 'Unknown radio option'))}' using locator {field['locator']}")
         return self.click_element(
-            tuple(field["locator"]),
+            self._field_target(field),
             desc=field.get("label", f"radio option {field.get('value', '')}"),
             fatal=False
         )
 
     def _fill_checkbox_field(self, field: Dict) -> bool:
         """Handle checkbox fields. AI provides locator for the specific checkbox."""
-        if not isinstance(field, dict) or "locator" not in field:
-            self.logger.error(f"{self.log_prefix}Invalid field format for _fill_checkbox_field: {field}")
-            return False
-
         # Similar to radio, AI's locator should point to the checkbox input.
         # The 'value' might indicate whether it should be checked (e.g., "true", "yes") or a specific choice.
         # For simplicity, if a checkbox field is identified, we assume it should be checked.
@@ -625,17 +881,13 @@ Example response:
         
         self.logger.info(f"{self.log_prefix}Attempting to click checkbox for '{field.get('label', 'Unknown checkbox')}' using locator {field['locator']}")
         return self.click_element(
-            tuple(field["locator"]),
+            self._field_target(field),
             desc=field.get("label", "checkbox"),
             fatal=False
         )
 
     def _fill_file_field(self, field: Dict) -> bool:
         """Handle file upload fields based on AI instruction."""
-        if not isinstance(field, dict) or "locator" not in field:
-            self.logger.error(f"{self.log_prefix}Invalid field format for _fill_file_field: {field}")
-            return False
-
         # AI should specify 'document_type' (e.g., "resume", "cover_letter")
         # that maps to keys in self.document_paths
         doc_type = field.get("document_type")
@@ -652,7 +904,7 @@ Example response:
 
         self.logger.info(f"{self.log_prefix}Uploading file for '{field.get('label', doc_type)}' from path '{file_path}'")
         return self.upload_file(
-            tuple(field["locator"]),
+            self._field_target(field),
             file_path,
             desc=field.get("label", f"{doc_type} file input"),
             fatal=False
@@ -718,12 +970,6 @@ Example response:
         # Try generic phrases near the field, but this is a long shot.
         # The EEO handling is more comprehensive for dedicated EEO questions.
         # For general fields, it's hard to guess.
-        decline_options_xpaths = [
-            ".//*[self::option or self::label or self::span][contains(translate(normalize-space(.), 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz'), 'prefer not to say')]",
-            ".//*[self::option or self::label or self::span][contains(translate(normalize-space(.), 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz'), 'decline to self-identify')]",
-            # Add more generic xpaths if necessary, relative to the field's context if possible
-        ]
-
         try:
             # Find the primary element of the field first to anchor the search
             primary_element = self.find_element(tuple(field["locator"]), wait_time=3, fatal=False, element_name=f"Primary element for {field_label}")
@@ -733,21 +979,17 @@ Example response:
 
             # Search for decline options in the vicinity of the primary element
             # This looks for descendants. Might need preceding-sibling, following-sibling, parent etc.
-            for i, decline_xpath_suffix in enumerate(decline_options_xpaths):
+            # One query matches every decline phrase (one implicit wait on a miss, not one per phrase)
+            for decline_element in primary_element.find_elements(By.XPATH, _PREFER_NOT_OPTION_XPATH):
                 try:
-                    # Assuming primary_element is a Selenium WebElement
-                    decline_element = primary_element.find_element(By.XPATH, decline_xpath_suffix) # Search relative to element
-                    if decline_element:
-                        if decline_element.tag_name == 'option':
-                            # This would require getting the Select parent and selecting by this option's text/value
-                            self.logger.info(f"{self.log_prefix}Found 'prefer not to say' option for '{field_label}', but it's an <option>. Complex selection needed.")
-                            # TODO: Implement selection if it's an option within a select.
-                            return False # Placeholder
-                        elif self.click_element(decline_element, desc=f"Prefer not to say for {field_label} (Strategy {i})", wait_time=2, fatal=False):
-                            self.logger.info(f"{self.log_prefix}Clicked 'prefer not to say' option for '{field_label}'.")
-                            return True
-                except NoSuchElementException:
-                    continue # Try next XPath strategy
+                    if decline_element.tag_name == 'option':
+                        # This would require getting the Select parent and selecting by this option's text/value
+                        self.logger.info(f"{self.log_prefix}Found 'prefer not to say' option for '{field_label}', but it's an <option>. Complex selection needed.")
+                        # TODO: Implement selection if it's an option within a select.
+                        return False # Placeholder
+                    elif self.click_element(decline_element, desc=f"Prefer not to say for {field_label}", wait_time=2, fatal=False):
+                        self.logger.info(f"{self.log_prefix}Clicked 'prefer not to say' option for '{field_label}'.")
+                        return True
                 except Exception as e_inner:
                     self.logger.warning(f"{self.log_prefix}Error while trying to click 'prefer not to say' for '{field_label}': {e_inner}")
                     
@@ -782,16 +1024,8 @@ Example response:
             else:
                 self.logger.warning(f"{self.log_prefix}Default resume input found, but upload failed. Trying other methods.")
 
-        # 2. Try common explicit "Resume" upload locators
-        # Variations in naming conventions for resume inputs
-        common_resume_xpaths = [
-            "//input[@type='file' and (@name='resume' or @id='resume' or contains(@aria-label, 'resume') or contains(@placeholder, 'resume'))]",
-            "//button[contains(translate(., 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz'), 'upload resume')]/preceding-sibling::input[@type='file']", # Button triggers hidden input
-            "//label[contains(translate(., 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz'), 'resume')]/following-sibling::div//input[@type='file']", # Label then input nested
-            "//div[contains(@class, 'resume-upload-trigger')]//input[@type='file']" # Custom component
-        ]
-        for i, xpath in enumerate(common_resume_xpaths):
-            locator = (By.XPATH, xpath)
+        # 2. Try common explicit "Resume" upload locators (_RESUME_INPUT_LOCATORS)
+        for i, locator in enumerate(_RESUME_INPUT_LOCATORS):
             # self.logger.debug(f"{self.log_prefix}Trying common resume locator strategy {i+1}: {locator}")
             if self.find_element(locator, wait_time=1, fatal=False, element_name=f"Resume Input (Common Strategy {i+1})"):
                 if self.upload_file(locator, resume_path, desc=f"Resume (Common Strategy {i+1})"):
@@ -799,73 +1033,23 @@ Example response:
                     return True
                 else:
                     self.logger.warning(f"{self.log_prefix}Common resume input (Strategy {i+1}) found, but upload failed.")
-        
-        # 3. Fallback to AI locator discovery
-        self.logger.info(f"{self.log_prefix}Default and common resume locators failed or not found. Attempting AI locator discovery for resume.")
-        form_element = self.find_element(self.LOCATORS["application_form"], element_name="Application Form for Resume AI analysis")
-        if not form_element:
-            self.logger.error(f"{self.log_prefix}Application form not found, cannot use AI to find resume field.")
-            return False # Cannot proceed with AI if form is missing
-            
-        form_html = form_element.get_attribute('outerHTML')
-        
-        # Slightly more detailed prompt for file input
-        prompt = """Analyze this HTML chunk of an application form. Identify the primary file input field for uploading a RESUME.
-        Focus on <input type="file"> elements. Consider labels like "Resume", "CV", "Attach Resume".
-        Prioritize inputs that accept PDF or DOCX files if specified.
-
-        Current Profile:
-        {profile}
 
-        Job Details:
-        {job}
-
-        HTML Chunk:
-        {chunk}
-
-        Summary of previous processing: {summary}
-        Chunk {chunk_num} of {total_chunks}
-
-        Return a VALID JSON object between ```json ``` markers with the locator for the resume upload field:
-        ```json
-        {{
-            "field_label": "Resume Upload", // The identified label of the field
-            "locator": ["xpath", "//input[@id='resume_upload_input']"], // Precise locator as ["type", "value"]
-            "file_types": ["pdf", "docx", "txt"], // Optional: detected accepted file types
-            "summary": "Found resume input field."
-        }}
-        ```
-        If no suitable resume input is found in this chunk, return null for "locator".
-        """
-        validated_job_id = self._validate_job_id(self.job_data.get('job_id'))
-        ai_result = self.analyze_large_html_with_ai(
-            form_html, 
-            prompt,
-            cache_key=f"resume_upload_locator_{validated_job_id}"
-            )
+        # 2b. File input labelled "resume" (label text / upload button around the input)
+        locator = self._file_input_by_text("resume")
+        if locator and self.upload_file(locator, resume_path, desc="Resume (by label)", fatal=False):
+            self.logger.info(f"{self.log_prefix}Resume uploaded using the input labelled 'resume'.")
+            return True
         
-        if ai_result and ai_result.get("locator"):
-            ai_locator_list = ai_result["locator"] # Expected ["type", "value"]
-            # Log this AI-identified locator
-            self._log_ai_locator(
-                label=ai_result.get("field_label", "Resume Upload Field (AI-identified)"),
-                locator=ai_locator_list, # Pass the list directly
-                context="Greenhouse Resume Upload (AI)",
-                ats_platform="Greenhouse",
-                job_id_str=validated_job_id
-            )
-            
-            self.logger.info(f"{self.log_prefix}AI identified resume locator: {ai_locator_list}. Attempting upload.")
-            if self.upload_file(
-                tuple(ai_locator_list), # Convert list to tuple for upload_file
-                resume_path,
-                desc="Resume (AI-identified)"
-            ):
+        # 3. Fallback to the resume input found by the form analysis
+        self.logger.info(f"{self.log_prefix}Default and common resume locators failed or not found. Using AI form analysis for resume.")
+        ai_locator = self._form_document_locator("resume_input")
+        if ai_locator:
+            self.logger.info(f"{self.log_prefix}AI identified resume locator: {ai_locator}. Attempting upload.")
+            if self.upload_file(ai_locator, resume_path, desc="Resume (AI-identified)"):
                 self.logger.info(f"{self.log_prefix}Resume uploaded successfully using AI-identified locator.")
                 return True
-            else:
-                 self.logger.error(f"{self.log_prefix}AI identified resume locator {ai_locator_list}, but upload failed.")
-                 # Fall through to raise ApplicationError as a last resort.
+            self.logger.error(f"{self.log_prefix}AI identified resume locator {ai_locator}, but upload failed.")
+            # Fall through to raise ApplicationError as a last resort.
         
         self.logger.error(f"{self.log_prefix}Could not locate and successfully use resume upload field after all attempts.")
         raise ApplicationError("Could not locate or use resume upload field.") # Critical failure
@@ -884,14 +1068,7 @@ Example response:
         """Handle cover letter upload. Tries common patterns, then optionally AI."""
         self.logger.info(f"{self.log_prefix}Attempting to upload cover letter from: {cover_letter_path}")
 
-        # Common cover letter input locators
-        common_cl_xpaths = [
-            "//input[@type='file' and (contains(@name, 'cover') or contains(@id, 'cover') or contains(@aria-label, 'cover') or contains(@placeholder, 'cover'))]",
-            "//button[contains(translate(., 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz'), 'upload cover letter')]/preceding-sibling::input[@type='file']",
-            "//label[contains(translate(., 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz'), 'cover letter')]/following-sibling::div//input[@type='file']",
-        ]
-        for i, xpath in enumerate(common_cl_xpaths):
-            locator = (By.XPATH, xpath)
+        for i, locator in enumerate(_COVER_LETTER_INPUT_LOCATORS):
             # self.logger.debug(f"{self.log_prefix}Trying common cover letter locator strategy {i+1}: {locator}")
             cl_input_element = self.find_element(locator, wait_time=2, fatal=False, element_name=f"Cover Letter Input (Strategy {i+1})")
             if cl_input_element:
@@ -902,18 +1079,26 @@ Example response:
                     self.logger.warning(f"{self.log_prefix}Cover letter input (Strategy {i+1}) found, but upload failed. It might be optional.")
                     return False # Indicate failure to upload even if field found
         
-        # Optional: AI-assisted cover letter field discovery (similar to resume, if desired)
-        # For now, if common locators fail, we assume it's optional or not easily found.
-        # Add AI discovery if cover letters are critical and often have varied locators.
-        # Example AI call would mirror _upload_resume's AI part, with "cover letter" keywords.
-        
+        # File input labelled "cover letter"
+        locator = self._file_input_by_text("cover letter")
+        if locator:
+            if self.upload_file(locator, cover_letter_path, desc="Cover Letter (by label)", fatal=False):
+                self.logger.info(f"{self.log_prefix}Cover letter uploaded using the input labelled 'cover letter'.")
+                return True
+            self.logger.warning(f"{self.log_prefix}Cover letter input found by label, but upload failed. It might be optional.")
+            return False
+
+        # Cover letter input found by the form analysis (no extra AI call; already run by fill_basic_info)
+        ai_locator = self._form_document_locator("cover_letter_input")
+        if ai_locator:
+            self.logger.info(f"{self.log_prefix}AI identified cover letter locator: {ai_locator}. Attempting upload.")
+            if self.upload_file(ai_locator, cover_letter_path, desc="Cover Letter (AI-identified)", fatal=False):
+                self.logger.info(f"{self.log_prefix}Cover letter uploaded successfully using AI-identified locator.")
+                return True
+            self.logger.warning(f"{self.log_prefix}AI identified cover letter locator {ai_locator}, but upload failed.")
+
         # If no specific "cover letter" input is found, check for generic additional document uploads
-        generic_doc_xpaths = [
-            "//input[@type='file' and (contains(@name, 'document') or contains(@id, 'additionalFile') or contains(@aria-label, 'additional document'))]",
-            "//label[contains(translate(., 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz'), 'additional document')]/following-sibling::div//input[@type='file']"
-        ]
-        for i, xpath in enumerate(generic_doc_xpaths):
-            locator = (By.XPATH, xpath)
+        for i, locator in enumerate(_GENERIC_DOCUMENT_INPUT_LOCATORS):
             # self.logger.debug(f"{self.log_prefix}Trying generic document locator for cover letter (Strategy {i+1}): {locator}")
             if self.find_element(locator, wait_time=1, fatal=False, element_name=f"Generic Document Input for CL (Strategy {i+1})"):
                 # Check if this field has already been used (e.g. by resume if locators were ambiguous)
@@ -926,12 +1111,40 @@ Example response:
                     self.logger.warning(f"{self.log_prefix}Generic document input for CL (Strategy {i+1}) found, but upload failed.")
                     return False
 
+        locator = self._file_input_by_text("additional document")
+        if locator:
+            if self.upload_file(locator, cover_letter_path, desc="Cover Letter as Generic Document (by label)", fatal=False):
+                self.logger.info(f"{self.log_prefix}Cover letter uploaded to the input labelled 'additional document'.")
+                return True
+            self.logger.warning(f"{self.log_prefix}Generic document input for CL found by label, but upload failed.")
+            return False
+
         self.logger.info(f"{self.log_prefix}No clear cover letter upload field found or upload failed. Skipping as it's often optional.")
         return False # Indicates cover letter was not uploaded.
 
 
+    def _answer_text_question(self, locator: Tuple[str, str], q_text: str, q_answer: Any) -> bool:
+        """Type the AI's answer into a text/textarea question"""
+        if q_answer is None: # Allow empty string answer if AI suggests it
+            self.logger.warning(f"{self.log_prefix}No answer provided by AI for text question '{q_text}'. Skipping typing.")
+            return True # Not necessarily a failure, could be optional
+        return self.type_text(locator, str(q_answer), desc=q_text, fatal=False)
+
+    def _answer_option_question(self, locator: Tuple[str, str], q_text: str, q_answer: Any) -> bool:
+        """Click the radio/checkbox option the AI's locator points at"""
+        # For radio/checkbox, the locator should ideally point to the specific option.
+        # The 'answer' from AI might be redundant if locator is specific, or it might be the 'value' to verify.
+        return self.click_element(locator, desc=f"{q_text} (Option: {q_answer})", fatal=False)
+
+    def _answer_select_question(self, locator: Tuple[str, str], q_text: str, q_answer: Any) -> bool:
+        """Select the AI's answer (option text) in a dropdown question"""
+        if not q_answer:
+            self.logger.warning(f"{self.log_prefix}No answer (option text) provided by AI for select question '{q_text}'.")
+            return True # Optional select might not need an answer
+        return self.select_dropdown_option(locator, option_text=str(q_answer), desc=q_text, fatal=False)
+
     def _answer_ai_questions(self, questions_data: List[Dict]) -> bool: # Renamed from _answer_questions
-        """Answers questions based on AI analysis from _handle_custom_questions_with_ai."""
+        """Answers questions based on AI analysis from _analyze_form_with_ai."""
         if not questions_data:
             self.logger.info(f"{self.log_prefix}No AI-identified custom questions to answer.")
             return True
@@ -953,27 +1166,12 @@ Example response:
 
                 self.logger.info(f"{self.log_prefix}Answering question: '{q_text[:60]}...' (Type: {q_type}) with answer: '{str(q_answer)[:50]}...'")
 
-                success_this_q = False
-                if q_type in ["text", "textarea"]:
-                    if q_answer is not None: # Allow empty string answer if AI suggests it
-                        success_this_q = self.type_text(q_locator_tuple, str(q_answer), desc=q_text, fatal=False)
-                    else: # No answer from AI for a text field
-                        self.logger.warning(f"{self.log_prefix}No answer provided by AI for text question '{q_text}'. Skipping typing.")
-                        success_this_q = True # Not necessarily a failure, could be optional
-                
-                elif q_type in ["radio", "checkbox"]:
-                    # For radio/checkbox, the locator should ideally point to the specific option.
-                    # The 'answer' from AI might be redundant if locator is specific, or it might be the 'value' to verify.
-                    success_this_q = self.click_element(q_locator_tuple, desc=f"{q_text} (Option: {q_answer})", fatal=False)
-                
-                elif q_type == "select":
-                    if q_answer:
-                        success_this_q = self.select_dropdown_option(q_locator_tuple, option_text=str(q_answer), desc=q_text, fatal=False)
-                    else:
-                        self.logger.warning(f"{self.log_prefix}No answer (option text) provided by AI for select question '{q_text}'.")
-                        success_this_q = True # Optional select might not need an answer
+                handler_method = self._question_handlers.get(q_type)
+                if handler_method:
+                    success_this_q = handler_method(q_locator_tuple, q_text, q_answer)
                 else:
                     self.logger.warning(f"{self.log_prefix}Unsupported question type '{q_type}' for question: '{q_text}'")
+                    success_this_q = False
                     # all_successful = False # Or just skip unsupported
 
                 if not success_this_q:
@@ -1058,6 +1256,8 @@ Example response:
         """Complete application flow with enhanced error handling and manual intervention."""
         try:
             self._ai_cache.clear()  # Clear previous analysis
+            self._form_analysis = None
+            self._outer_html_cache = None
 
             if not self.navigate_to_start():
                 # Use a specific status from config if available, e.g. config.JOB_STATUS_APP_FAILED_NAVIGATION
@@ -4,9 +4,14 @@ Browser-Use Session Manager - Maintains a single persistent browser session
 IMPORTANT: Browser-use with the SAME user_data_dir automatically reuses the same browser instance.
 This manager ensures we use a consistent profile directory and initialized LLM.
 """
+import asyncio
 import logging
+import os
+import stat
+import threading
+import time
 from pathlib import Path
-from typing import Optional
+from typing import Dict, Optional, Tuple
 
 try:
     from browser_use import Agent
@@ -22,6 +27,15 @@ except ImportError:
 import config
 
 
+def _stat_or_none(path: str) -> Optional[os.stat_result]:
+    """stat() a regular file, or None if it doesn't exist / isn't a file"""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st if stat.S_ISREG(st.st_mode) else None
+
+
 class BrowserUseSessionManager:
     """
     Singleton manager for browser-use sessions.
@@ -50,6 +64,17 @@ class BrowserUseSessionManager:
         self._initialized = False
         self._session_count = 0
 
+        # Document paths confirmed on disk -> (time of the check, stat result) (see file_stat)
+        self._file_stat_cache: Dict[str, Tuple[float, os.stat_result]] = {}
+
+        # Extra browser profiles for concurrent agents, keyed by context id (see create_agent)
+        self._profile_dir: Optional[Path] = None
+        self._context_profiles: Dict[int, BrowserProfile] = {}
+
+        # Long-lived event loop for running agents (see get_loop)
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_lock = threading.Lock()
+
         self.logger.info("BrowserUseSessionManager created (singleton)")
 
     @classmethod
@@ -89,16 +114,17 @@ class BrowserUseSessionManager:
             # Use config value if set, otherwise default to .job_agent_browser_profile
             if config.CHROME_USER_DATA_DIR:
                 app_profile_dir = Path(config.CHROME_USER_DATA_DIR)
-                self.logger.info(f"Using Chrome user data directory from config: {app_profile_dir}")
+                self.logger.info("Using Chrome user data directory from config: %s", app_profile_dir)
                 self.logger.warning("⚠️  Using main Chrome profile - CLOSE ALL Chrome windows before running job-agent!")
                 self.logger.warning("⚠️  If browser doesn't open, Chrome may be locked by another instance.")
             else:
                 app_profile_dir = Path.home() / '.job_agent_browser_profile'
-                self.logger.info(f"Using default profile directory: {app_profile_dir}")
+                self.logger.info("Using default profile directory: %s", app_profile_dir)
 
             app_profile_dir.mkdir(parents=True, exist_ok=True)
-            self.logger.info(f"✓ Profile directory ready: {app_profile_dir}")
-            self.logger.info(f"✓ Browser will open in VISIBLE mode (headless=False)")
+            self._profile_dir = app_profile_dir
+            self.logger.info("✓ Profile directory ready: %s", app_profile_dir)
+            self.logger.info("✓ Browser will open in VISIBLE mode (headless=False)")
 
             # Create browser profile (shared across all agents)
             # Using the SAME user_data_dir means browser-use reuses the same browser!
@@ -120,10 +146,26 @@ class BrowserUseSessionManager:
             return True
 
         except Exception as e:
-            self.logger.error(f"Failed to initialize session manager: {e}", exc_info=True)
+            self.logger.error("Failed to initialize session manager: %s", e, exc_info=True)
             return False
 
-    def create_agent(self, task: str, available_file_paths: list = None) -> Optional[Agent]:
+    def _profile_for_context(self, context_id: int) -> BrowserProfile:
+        """
+        Browser profile for a concurrent slot. Context 0 is the main persistent profile;
+        other slots get their own user_data_dir next to it (Chrome locks a profile
+        directory to one browser), created once and reused for the session.
+        """
+        if context_id == 0 or self._profile_dir is None:
+            return self.profile
+        if context_id not in self._context_profiles:
+            ctx_dir = self._profile_dir.with_name(f"{self._profile_dir.name}_ctx{context_id}")
+            ctx_dir.mkdir(parents=True, exist_ok=True)
+            self._context_profiles[context_id] = self.profile.model_copy(update={'user_data_dir': str(ctx_dir)})
+            self.logger.info("✓ Browser profile for context #%s: %s", context_id, ctx_dir)
+        return self._context_profiles[context_id]
+
+    def create_agent(self, task: str, available_file_paths: list = None, context_id: int = 0,
+                     system_extension: Optional[str] = None) -> Optional[Agent]:
         """
         Create a new Agent instance.
 
@@ -133,6 +175,10 @@ class BrowserUseSessionManager:
         Args:
             task: The task description for the agent
             available_file_paths: List of file paths the agent can access for uploads
+            context_id: Concurrent slot (0 = main profile); agents running at the same time
+                        should use different ids so each drives its own browser
+            system_extension: Job-independent instructions appended to the agent's system
+                              message, so they form the same prompt prefix on every call
 
         Returns:
             Agent instance, or None if creation failed
@@ -147,34 +193,83 @@ class BrowserUseSessionManager:
             session_id = self._session_count
 
             if session_id == 1:
-                self.logger.info(f"[Session #{session_id}] Creating first agent (will initialize browser on first run)...")
+                self.logger.info("[Session #%s] Creating first agent (will initialize browser on first run)...", session_id)
             else:
-                self.logger.info(f"[Session #{session_id}] Creating agent (will REUSE existing browser)...")
+                self.logger.info("[Session #%s] Creating agent (will REUSE existing browser)...", session_id)
+
+            agent_kwargs = {}
+            if system_extension:
+                agent_kwargs['extend_system_message'] = system_extension
 
             # Create agent - browser-use handles browser reuse automatically!
             agent = Agent(
                 task=task,
                 llm=self.llm,  # Reused LLM
-                browser_profile=self.profile,  # Same profile = same browser!
+                browser_profile=self._profile_for_context(context_id),  # Same profile = same browser!
                 use_vision=True,
                 max_failures=5,
                 max_actions_per_step=10,
                 available_file_paths=available_file_paths or [],
                 llm_timeout=90,
+                **agent_kwargs,
             )
 
-            self.logger.info(f"[Session #{session_id}] ✓ Agent created")
+            self.logger.info("[Session #%s] ✓ Agent created", session_id)
             return agent
 
         except Exception as e:
-            self.logger.error(f"Failed to create agent: {e}", exc_info=True)
+            self.logger.error("Failed to create agent: %s", e, exc_info=True)
+            return None
+
+    def get_loop(self) -> asyncio.AbstractEventLoop:
+        """
+        Event loop shared by every application in this session, running on a daemon thread.
+        Submitting agents here (asyncio.run_coroutine_threadsafe) instead of a fresh
+        asyncio.run() per job keeps the browser connection and the LLM client's HTTP
+        connections alive between jobs.
+        """
+        with self._loop_lock:
+            if self._loop is None or self._loop.is_closed():
+                self._loop = asyncio.new_event_loop()
+                threading.Thread(target=self._loop.run_forever, name="browser-use-loop", daemon=True).start()
+                self.logger.info("Started shared event loop for browser-use agents")
+        return self._loop
+
+    # How long a positive file check is trusted before it is re-checked
+    FILE_CHECK_TTL_SECONDS = 60
+
+    def file_stat(self, path: Optional[str]) -> Optional[os.stat_result]:
+        """
+        stat result for path if it is an existing file, else None. The same resume/cover
+        letter is checked on every application, so a positive result (with its size/mtime)
+        is reused for FILE_CHECK_TTL_SECONDS instead of stat()ing again. Misses are never
+        cached: a tailored document may appear later.
+        """
+        if not path:
             return None
+        now = time.monotonic()
+        cached = self._file_stat_cache.get(path)
+        if cached is not None and now - cached[0] < self.FILE_CHECK_TTL_SECONDS:
+            return cached[1]
+        st = _stat_or_none(path)
+        if st is not None:
+            self._file_stat_cache[path] = (now, st)
+        else:
+            self._file_stat_cache.pop(path, None)
+        return st
 
     def reset(self):
         """Reset the manager state (useful for testing)"""
         self._initialized = False
         self._session_count = 0
+        self._file_stat_cache.clear()
+        with self._loop_lock:
+            if self._loop is not None and not self._loop.is_closed():
+                self._loop.call_soon_threadsafe(self._loop.stop)
+            self._loop = None
         self.profile = None
+        self._profile_dir = None
+        self._context_profiles.clear()
         self.llm = None
         self.logger.info("Session manager reset")
 
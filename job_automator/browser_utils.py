@@ -13,6 +13,33 @@ logger = logging.getLogger(__name__)
 
 INSTANCE = None # Singleton WebDriver instance (optional pattern)
 
+
+def _widen_connection_pool(driver, maxsize: int):
+    """
+    Raise the urllib3 pool size of the driver's HTTP client (default 1 connection per host),
+    so WebDriver commands issued from more than one thread don't queue on a single
+    connection or log "Connection pool is full". Newly created pools pick up the setting.
+    Selenium has no public hook for this on webdriver.Chrome, so each private attribute is
+    checked first and the default pool is kept when the installed version lacks it.
+    """
+    executor = getattr(driver, 'command_executor', None)
+    # selenium >= 4.26 rebuilds its pool manager from ClientConfig; record the size there too.
+    # (RemoteConnection reads the kwargs from a nested "init_args_for_pool_manager" key.)
+    client_config = getattr(executor, '_client_config', None)
+    if client_config is not None and hasattr(client_config, 'init_args_for_pool_manager'):
+        init_args = dict(client_config.init_args_for_pool_manager or {})
+        init_args['init_args_for_pool_manager'] = {**init_args.get('init_args_for_pool_manager', {}), 'maxsize': maxsize}
+        client_config.init_args_for_pool_manager = init_args
+
+    pool_manager = getattr(executor, '_conn', None)
+    pool_kw = getattr(pool_manager, 'connection_pool_kw', None)
+    if not isinstance(pool_kw, dict) or not hasattr(pool_manager, 'clear'):
+        logger.debug("WebDriver HTTP client has no urllib3 pool manager to resize; keeping its default pool size.")
+        return
+    pool_kw['maxsize'] = maxsize
+    pool_manager.clear()  # Drop the existing maxsize=1 pool; the next request opens a wider one
+    logger.debug(f"WebDriver HTTP pool maxsize set to {maxsize}.")
+
 def get_webdriver(browser_type="chrome", headless=False, force_new=False):
     """
     Initializes and returns a Selenium WebDriver instance.
@@ -69,6 +96,7 @@ def get_webdriver(browser_type="chrome", headless=False, force_new=False):
             return None
 
         # Configure driver settings
+        _widen_connection_pool(driver, config.WEBDRIVER_POOL_MAXSIZE)
         driver.set_page_load_timeout(120) # Longer page load timeout
         driver.implicitly_wait(3) # Use short implicit wait, rely on explicit waits
 
@@ -23,6 +23,9 @@ logger = logging.getLogger(__name__)
 # --- Gemini Client Setup ---
 GEMINI_LLM = None
 LLM_INIT_STATUS = "Not Initialized"
+# Same model constrained to emit JSON (response_mime_type), used for structured page analysis.
+GEMINI_JSON_LLM = None
+JSON_LLM_INIT_STATUS = "Not Initialized"
 
 def initialize_llm():
     """Initializes the Gemini LLM client if not already done."""
@@ -69,6 +72,34 @@ def get_llm_client():
 
     return GEMINI_LLM
 
+def get_json_llm_client():
+    """
+    Returns a Gemini client in JSON mode (response_mime_type="application/json"), whose
+    replies are always parseable JSON. Returns None if it cannot be created, in which case
+    callers should fall back to get_llm_client() and extract the ```json block themselves.
+    """
+    global GEMINI_JSON_LLM, JSON_LLM_INIT_STATUS
+    if GEMINI_JSON_LLM or JSON_LLM_INIT_STATUS != "Not Initialized":
+        return GEMINI_JSON_LLM
+
+    if not config.GEMINI_API_KEY:
+        JSON_LLM_INIT_STATUS = "API Key Missing"
+        return None
+    try:
+        GEMINI_JSON_LLM = ChatGoogleGenerativeAI(
+            model=config.GEMINI_MODEL_NAME,
+            temperature=0.3,
+            google_api_key=config.GEMINI_API_KEY,
+            response_mime_type="application/json",
+        )
+        JSON_LLM_INIT_STATUS = "Success"
+        logger.info(f"JSON-mode ChatGoogleGenerativeAI initialized with model: {config.GEMINI_MODEL_NAME}")
+    except Exception as e:
+        JSON_LLM_INIT_STATUS = f"Error: {e}"
+        logger.warning(f"JSON mode not available for {config.GEMINI_MODEL_NAME}, falling back to text responses: {e}")
+        GEMINI_JSON_LLM = None
+    return GEMINI_JSON_LLM
+
 # Example Usage / Test
 if __name__ == '__main__':
      # Need to set up basic logging if running standalone
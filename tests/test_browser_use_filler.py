@@ -0,0 +1,149 @@
+"""Tests for the browser-use filler's mid-run stop detection"""
+import asyncio
+import logging
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("dotenv")  # config.py needs the project's runtime dependencies
+pytest.importorskip("yaml")
+
+from job_automator.ats_fillers import browser_use_filler as buf
+
+
+def _filler():
+    """A BrowserUseFiller with only the state _on_step_end touches (no browser-use needed)"""
+    filler = buf.BrowserUseFiller.__new__(buf.BrowserUseFiller)
+    filler.logger = logging.getLogger(__name__)
+    filler._early_success = False
+    filler._blocked = False
+    filler._step_count = 0
+    return filler
+
+
+class _FakeAgent:
+    def __init__(self, *contents):
+        self.state = SimpleNamespace(last_result=[SimpleNamespace(extracted_content=c) for c in contents])
+        self.stopped = False
+
+    def stop(self):
+        self.stopped = True
+
+
+def _run_step(*contents):
+    filler, agent = _filler(), _FakeAgent(*contents)
+    asyncio.run(filler._on_step_end(agent))
+    return filler, agent
+
+
+@pytest.mark.parametrize("text", [
+    "Input x into Email confirmation field",
+    "Extracted: You will receive a confirmation email once you submit.",
+])
+def test_confirmation_wording_before_submit_does_not_stop(text):
+    filler, agent = _run_step(text)
+    assert not agent.stopped
+    assert not filler._early_success
+
+
+@pytest.mark.parametrize("text", [
+    "Your application has been submitted.",
+    "Thank you for applying to Acme!",
+])
+def test_submission_confirmation_stops_early(text):
+    filler, agent = _run_step(text)
+    assert agent.stopped
+    assert filler._early_success
+
+
+def test_recaptcha_footer_is_not_a_blocker():
+    filler, agent = _run_step(
+        "Extracted page text: Apply for this job ... This site is protected by reCAPTCHA and the "
+        "Google Privacy Policy and Terms of Service apply."
+    )
+    assert not agent.stopped
+    assert not filler._blocked
+
+
+@pytest.mark.parametrize("text", [
+    "Please complete the CAPTCHA to continue",
+    "Verify you are human",
+])
+def test_captcha_challenge_stops_as_blocked(text):
+    filler, agent = _run_step(text)
+    assert agent.stopped
+    assert filler._blocked
+
+
+def test_inner_timeout_is_retryable():
+    assert buf._is_retryable(asyncio.TimeoutError())
+    assert not buf._is_retryable(ValueError("bad selector"))
+
+
+def test_agent_output_text_ignores_the_task_prompt():
+    result = SimpleNamespace(
+        final_result=lambda: "JOB_2_DONE",
+        extracted_content=lambda: ["Filled job 1", None],
+    )
+    text = buf._agent_output_text(result)
+    assert "JOB_2_DONE" in text and "Filled job 1" in text
+    assert "JOB_1_DONE" not in text
+
+
+class _FakeRunAgent:
+    """Agent whose run() reports the given final message without touching a browser"""
+    def __init__(self, final_text):
+        self.final_text = final_text
+        self.run_kwargs = None
+
+    async def run(self, **kwargs):
+        self.run_kwargs = kwargs
+        return SimpleNamespace(final_result=lambda: self.final_text, extracted_content=lambda: [])
+
+
+class _FakeSessionManager:
+    _initialized = True
+    _session_count = 0
+
+    def __init__(self, agent):
+        self.agent = agent
+        self.create_args = None
+
+    def create_agent(self, task, available_files, **kwargs):
+        self.create_args = (task, available_files, kwargs)
+        return self.agent
+
+
+def _apply(monkeypatch, final_text):
+    agent = _FakeRunAgent(final_text)
+    manager = _FakeSessionManager(agent)
+    monkeypatch.setattr(buf, "BrowserUseSessionManager", SimpleNamespace(get_instance=lambda: manager))
+    monkeypatch.setattr(buf.config, "GEMINI_API_KEY", "test-key")
+    monkeypatch.setattr(buf, "_already_applied", lambda key: False)
+    monkeypatch.setattr(buf, "_mark_applied", lambda key: None)
+    monkeypatch.setattr(buf, "_record_steps", lambda ats, steps: None)
+    monkeypatch.setattr(buf, "_adaptive_max_steps", lambda ats: 7)
+
+    filler = _filler()
+    filler.job_data = {"job_id": "42", "application_url": "https://boards.greenhouse.io/acme/jobs/42",
+                       "job_title": "Engineer", "company_name": "Acme"}
+    filler.document_paths = {}
+    filler._context_id = 0
+    filler._job_desc_short = ""
+    # Skip the profile/disk lookups behind the cached properties
+    filler.__dict__.update(_static_task_prologue="prologue", _file_stats={}, _available_files=[])
+    status = asyncio.run(filler.apply_async())
+    return status, agent, manager
+
+
+def test_apply_async_runs_the_agent(monkeypatch):
+    status, agent, manager = _apply(monkeypatch, "Your application has been submitted.")
+    assert status == buf.config.JOB_STATUS_APPLIED_SUCCESS
+    assert agent.run_kwargs["max_steps"] == 7
+    assert "https://boards.greenhouse.io/acme/jobs/42" in manager.create_args[0]
+
+
+def test_apply_async_reports_unconfirmed_run_as_ats_failure(monkeypatch):
+    status, agent, _ = _apply(monkeypatch, "Could not submit: required field missing")
+    assert agent.run_kwargs is not None
+    assert status == buf.config.JOB_STATUS_APP_FAILED_ATS